@@ -14,15 +14,35 @@ from datetime import datetime
 
 from .models import db, User, Project, Task, Dataflow
 from .services import ProjectService
+from .utils.json_provider import ORJSONProvider
 
 def create_app(config=None):
     """Create and configure the Flask application."""
     app = Flask(__name__, static_folder='assets')
+    app.json = ORJSONProvider(app)
     
     # Configuration
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///scitrace.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Compiled-statement cache; legacy Model.query calls are cached too, so
+    # this only needs to hold every distinct statement the app issues.
+    # Bulk inserts send up to insertmanyvalues_page_size rows per statement;
+    # the dialect still splits pages that exceed its bound-parameter limit
+    engine_options = {
+        'query_cache_size': 1200,
+        'insertmanyvalues_page_size': 10000
+    }
+    database_uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if database_uri not in ('sqlite://', 'sqlite:///:memory:'):
+        # Connection pool: reuse the most recently returned connection so
+        # idle ones can time out, and drop stale connections before use.
+        # In-memory SQLite gets a static pool that takes none of these
+        engine_options.update(pool_use_lifo=True, pool_pre_ping=True, pool_recycle=1800)
+    if database_uri.startswith(('postgresql://', 'postgresql+psycopg2://')):
+        # Batch executemany UPDATE/DELETE (e.g. BaseService.bulk_update) too
+        engine_options['executemany_mode'] = 'values_plus_batch'
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
     
     # Initialize extensions
     db.init_app(app)
@@ -60,6 +80,12 @@ def create_app(config=None):
     with app.app_context():
         db.create_all()
         
+        # create_all() skips existing tables, so add any indexes declared
+        # on the models that older databases don't have yet
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=db.engine, checkfirst=True)
+        
         # Create default admin user if none exists
         if not User.query.filter_by(username='admin').first():
             admin_user = User(
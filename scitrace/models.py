@@ -1,16 +1,54 @@
 """
 Database models for SciTrace
 
-Defines the data models for users, projects, tasks, and dataflows.
+Defines the data models for users, projects, tasks, dataflows, and background jobs.
 """
 
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from datetime import datetime, timezone
-import json
+
+import orjson
 
 db = SQLAlchemy()
 
+
+def dump_json_text(value):
+    """
+    Serialize a value to compact JSON text for a JSON-holding column.
+    
+    Non-string dict keys are converted to strings, as json.dumps does.
+    
+    Args:
+        value: JSON-serializable value
+    
+    Returns:
+        JSON string
+    """
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+
+class JSONText(db.TypeDecorator):
+    """
+    Stores a JSON-serializable value as JSON text.
+    
+    Values are encoded when the row is flushed and decoded once when it is
+    loaded, so reads hand back Python objects without re-parsing.
+    """
+    
+    impl = db.String
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return dump_json_text(value)
+    
+    def process_result_value(self, value, dialect):
+        if not value:
+            return None
+        return orjson.loads(value)
+
 class User(UserMixin, db.Model):
     """User model for authentication and user management."""
     
@@ -37,8 +75,8 @@ class Project(db.Model):
     project_id = db.Column(db.String(50), unique=True, nullable=False)  # e.g., I293DSA39
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    admin_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    collaborators = db.Column(db.String(500))  # JSON string of collaborators
+    admin_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    collaborators = db.Column(JSONText(500))  # list of collaborators, stored as JSON
     status = db.Column(db.String(20), default='ongoing')  # ongoing, completed, paused
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
@@ -55,10 +93,8 @@ class Project(db.Model):
         return f'<Project {self.name}>'
     
     def get_collaborators_list(self):
-        """Get collaborators as a list."""
-        if self.collaborators:
-            return json.loads(self.collaborators)
-        return []
+        """Get a copy of the collaborators list."""
+        return list(self.collaborators or [])
 
 class Task(db.Model):
     """Task model for project tasks."""
@@ -66,24 +102,41 @@ class Task(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # indexed by ix_task_user_created
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False, index=True)
     deadline = db.Column(db.DateTime)
     priority = db.Column(db.String(20), default='medium')  # low, medium, urgent
     status = db.Column(db.String(20), default='pending')  # pending, ongoing, done
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
+    @classmethod
+    def bulk_insert(cls, rows):
+        """
+        Insert many tasks with a single executemany INSERT.
+        
+        Skips the ORM unit of work, so no Task objects are created and the
+        caller is responsible for committing.
+        
+        Args:
+            rows: List of column-value dictionaries, one per task
+        """
+        if rows:
+            db.session.execute(cls.__table__.insert(), rows)
+    
     def __repr__(self):
         return f'<Task {self.title}>'
 
+# Serves the per-user task list, which is ordered newest first
+db.Index('ix_task_user_created', Task.user_id, Task.created_at.desc())
+
 class Dataflow(db.Model):
     """Dataflow model for visualizing research data workflows."""
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
@@ -95,32 +148,52 @@ class Dataflow(db.Model):
     def get_nodes(self):
         """Get nodes as a list."""
         if self.nodes:
-            return json.loads(self.nodes)
+            return orjson.loads(self.nodes)
         return []
     
     def get_edges(self):
         """Get edges as a list."""
         if self.edges:
-            return json.loads(self.edges)
+            return orjson.loads(self.edges)
         return []
     
     def get_metadata(self):
         """Get metadata as a dict."""
         if self.flow_metadata:
-            return json.loads(self.flow_metadata)
+            return orjson.loads(self.flow_metadata)
         return {}
     
     def set_nodes(self, nodes_list):
         """Set nodes from a list."""
-        self.nodes = json.dumps(nodes_list)
+        self.nodes = dump_json_text(nodes_list)
     
     def set_edges(self, edges_list):
         """Set edges from a list."""
-        self.edges = json.dumps(edges_list)
+        self.edges = dump_json_text(edges_list)
     
     def set_metadata(self, metadata_dict):
         """Set metadata from a dict."""
-        self.flow_metadata = json.dumps(metadata_dict)
+        self.flow_metadata = dump_json_text(metadata_dict)
     
     def __repr__(self):
         return f'<Dataflow {self.name}>'
+
+class Job(db.Model):
+    """Background job state, shared by every worker process that may be polled."""
+    
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    kind = db.Column(db.String(20), nullable=False)  # git, dataflow, dataset
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    project_id = db.Column(db.String(50))  # Project.project_id the job works on
+    status = db.Column(db.String(20), default='running')  # running, done, failed
+    details = db.Column(db.Text)  # JSON string of job-specific details
+    result = db.Column(db.Text)  # JSON string of the result once done
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    finished_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<Job {self.kind} {self.id}>'
+
+# Serves the running-job lookup made before starting a job for a project
+db.Index('ix_job_kind_project_status', Job.kind, Job.project_id, Job.status)
@@ -6,10 +6,9 @@ Provides data access methods for dataflow-related operations.
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
-import json
 
 from .base_repository import BaseRepository
-from ..models import Dataflow
+from ..models import Dataflow, dump_json_text
 from ..exceptions import DatabaseError, ValidationError
 
 
@@ -94,9 +93,9 @@ class DataflowRepository(BaseRepository):
             raise ValidationError(f"Dataflow '{name}' already exists in this project")
         
         # Convert data to JSON strings
-        nodes_json = json.dumps(nodes) if nodes else None
-        edges_json = json.dumps(edges) if edges else None
-        metadata_json = json.dumps(metadata) if metadata else None
+        nodes_json = dump_json_text(nodes) if nodes else None
+        edges_json = dump_json_text(edges) if edges else None
+        metadata_json = dump_json_text(metadata) if metadata else None
         
         return self.create(
             name=name,
@@ -121,7 +120,7 @@ class DataflowRepository(BaseRepository):
         Raises:
             DatabaseError: If database operation fails
         """
-        nodes_json = json.dumps(nodes)
+        nodes_json = dump_json_text(nodes)
         return self.update(dataflow_id, nodes=nodes_json, updated_at=datetime.now(timezone.utc))
     
     def update_edges(self, dataflow_id: int, edges: List[Dict]) -> Optional[Dataflow]:
@@ -138,7 +137,7 @@ class DataflowRepository(BaseRepository):
         Raises:
             DatabaseError: If database operation fails
         """
-        edges_json = json.dumps(edges)
+        edges_json = dump_json_text(edges)
         return self.update(dataflow_id, edges=edges_json, updated_at=datetime.now(timezone.utc))
     
     def update_metadata(self, dataflow_id: int, metadata: Dict) -> Optional[Dataflow]:
@@ -155,7 +154,7 @@ class DataflowRepository(BaseRepository):
         Raises:
             DatabaseError: If database operation fails
         """
-        metadata_json = json.dumps(metadata)
+        metadata_json = dump_json_text(metadata)
         return self.update(dataflow_id, flow_metadata=metadata_json, updated_at=datetime.now(timezone.utc))
     
     def update_structure(self, dataflow_id: int, nodes: List[Dict], edges: List[Dict],
@@ -176,13 +175,13 @@ class DataflowRepository(BaseRepository):
             DatabaseError: If database operation fails
         """
         update_data = {
-            'nodes': json.dumps(nodes),
-            'edges': json.dumps(edges),
+            'nodes': dump_json_text(nodes),
+            'edges': dump_json_text(edges),
             'updated_at': datetime.now(timezone.utc)
         }
         
         if metadata is not None:
-            update_data['flow_metadata'] = json.dumps(metadata)
+            update_data['flow_metadata'] = dump_json_text(metadata)
         
         return self.update(dataflow_id, **update_data)
     
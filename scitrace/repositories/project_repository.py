@@ -6,7 +6,6 @@ Provides data access methods for project-related operations.
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
-import json
 
 from .base_repository import BaseRepository
 from ..models import Project
@@ -147,15 +146,12 @@ class ProjectRepository(BaseRepository):
         if status not in valid_statuses:
             raise ValidationError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
         
-        # Convert collaborators to JSON string
-        collaborators_json = json.dumps(collaborators) if collaborators else None
-        
         return self.create(
             project_id=project_id,
             name=name,
             description=description,
             admin_id=admin_id,
-            collaborators=collaborators_json,
+            collaborators=collaborators or None,
             status=status
         )
     
@@ -233,8 +229,7 @@ class ProjectRepository(BaseRepository):
         collaborators = project.get_collaborators_list()
         if user_id not in collaborators:
             collaborators.append(user_id)
-            collaborators_json = json.dumps(collaborators)
-            return self.update(project_id, collaborators=collaborators_json, updated_at=datetime.now(timezone.utc))
+            return self.update(project_id, collaborators=collaborators, updated_at=datetime.now(timezone.utc))
         
         return project
     
@@ -259,8 +254,7 @@ class ProjectRepository(BaseRepository):
         collaborators = project.get_collaborators_list()
         if user_id in collaborators:
             collaborators.remove(user_id)
-            collaborators_json = json.dumps(collaborators)
-            return self.update(project_id, collaborators=collaborators_json, updated_at=datetime.now(timezone.utc))
+            return self.update(project_id, collaborators=collaborators, updated_at=datetime.now(timezone.utc))
         
         return project
     
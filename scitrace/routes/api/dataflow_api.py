@@ -10,7 +10,7 @@ from flask_login import login_required, current_user
 import os
 
 from ...models import Dataflow, db
-from ...services import MetadataOperationsService, FileOperationsService
+from ...services import MetadataOperationsService, FileOperationsService, shared_service
 
 bp = Blueprint('dataflow_api', __name__, url_prefix='/api')
 
@@ -48,8 +48,7 @@ def regenerate_dataflow(dataflow_id):
         return jsonify({'error': 'No dataset path found'}), 404
     
     try:
-        metadata_service = MetadataOperationsService()
-        dataflow_data = metadata_service.create_dataflow_from_dataset(dataset_path)
+        dataflow_data = shared_service(MetadataOperationsService).create_dataflow_from_dataset(dataset_path)
         
         dataflow.set_nodes(dataflow_data['nodes'])
         dataflow.set_edges(dataflow_data['edges'])
@@ -109,8 +108,7 @@ def get_stage_files(dataflow_id, stage_name):
     print(f"DEBUG: Mapped directory name: {directory_name}")
     
     try:
-        file_service = FileOperationsService()
-        stage_data = file_service.get_stage_files(dataset_path, directory_name)
+        stage_data = shared_service(FileOperationsService).get_stage_files(dataset_path, directory_name)
         
         if stage_data:
             print(f"DEBUG: Successfully retrieved stage data for {stage_name}")
@@ -146,8 +144,7 @@ def add_file_to_datalad(dataflow_id):
             return jsonify({'error': 'No dataset path found'}), 404
         
         # Use FileOperationsService to add file
-        file_service = FileOperationsService()
-        result = file_service.add_file_to_dataset(dataset_path, file_path, commit_message)
+        result = shared_service(FileOperationsService).add_file_to_dataset(dataset_path, file_path, commit_message)
         
         if result.get('status') == 'added':
             return jsonify({
@@ -184,8 +181,7 @@ def add_all_untracked_to_datalad(dataflow_id):
             return jsonify({'error': 'No dataset path found'}), 404
         
         # Use FileOperationsService to save stage changes
-        file_service = FileOperationsService()
-        result = file_service.save_stage_changes(dataset_path, stage_name, commit_message)
+        result = shared_service(FileOperationsService).save_stage_changes(dataset_path, stage_name, commit_message)
         
         if result.get('success'):
             return jsonify({
@@ -237,8 +233,6 @@ def run_script_with_datalad(dataflow_id):
             }), 404
         
         # Use FileOperationsService to run command in dataset
-        file_service = FileOperationsService()
-        
         # Build the full command with inputs and outputs
         full_command = command
         if command.startswith('python '):
@@ -272,7 +266,7 @@ def run_script_with_datalad(dataflow_id):
             # In a more advanced implementation, we could enhance the service to handle inputs/outputs
             pass
         
-        result = file_service.run_command_in_dataset(dataset_path, full_command, commit_message)
+        result = shared_service(FileOperationsService).run_command_in_dataset(dataset_path, full_command, commit_message)
         
         if result.get('status') == 'completed':
             return jsonify({
@@ -360,8 +354,7 @@ def save_stage(dataflow_id):
                 }), 500
         else:
             # Use FileOperationsService to save stage changes
-            file_service = FileOperationsService()
-            result = file_service.save_stage_changes(dataset_path, stage_name, commit_message)
+            result = shared_service(FileOperationsService).save_stage_changes(dataset_path, stage_name, commit_message)
             
             if result.get('status') == 'saved':
                 return jsonify({
@@ -451,13 +444,15 @@ def save_all_changes(dataflow_id):
                             subdataset_path = os.path.join(dataset_path, subdataset)
                             if os.path.exists(subdataset_path):
                                 subprocess.run(['datalad', 'save', '-m', commit_message], 
-                                             cwd=subdataset_path, capture_output=True, text=True, check=True)
+                                             cwd=subdataset_path, stdout=subprocess.DEVNULL,
+                                             stderr=subprocess.DEVNULL, check=True)
                                 save_attempts.append(f"Subdataset {subdataset} save: SUCCESS")
                         except subprocess.CalledProcessError:
                             # Try to save the subdataset reference from parent
                             try:
                                 subprocess.run(['datalad', 'save', '-m', commit_message, subdataset], 
-                                             cwd=dataset_path, capture_output=True, text=True, check=True)
+                                             cwd=dataset_path, stdout=subprocess.DEVNULL,
+                                             stderr=subprocess.DEVNULL, check=True)
                                 save_attempts.append(f"Subdataset {subdataset} reference save: SUCCESS")
                             except subprocess.CalledProcessError:
                                 save_attempts.append(f"Subdataset {subdataset} save: FAILED")
@@ -465,9 +460,11 @@ def save_all_changes(dataflow_id):
                     # Approach 4: Force git operations for persistent issues (like r4)
                     if 'r4' in status_result.stdout:
                         try:
-                            subprocess.run(['git', 'add', 'r4'], cwd=dataset_path, capture_output=True, text=True, check=True)
+                            subprocess.run(['git', 'add', 'r4'], cwd=dataset_path, stdout=subprocess.DEVNULL,
+                                           stderr=subprocess.PIPE, text=True, check=True)
                             subprocess.run(['git', 'commit', '-m', f'Force save subdataset reference: {commit_message}'], 
-                                         cwd=dataset_path, capture_output=True, text=True, check=True)
+                                         cwd=dataset_path, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                         text=True, check=True)
                             save_attempts.append("Force git add/commit for r4: SUCCESS")
                         except subprocess.CalledProcessError as e3:
                             save_attempts.append(f"Force git add/commit for r4: FAILED - {e3.stderr}")
@@ -9,7 +9,7 @@ from flask_login import login_required, current_user
 import os
 
 from ...models import Dataflow
-from ...services import FileOperationsService
+from ...services import FileOperationsService, GitOperationsService, shared_service
 
 bp = Blueprint('file_api', __name__, url_prefix='/api')
 
@@ -27,13 +27,14 @@ def open_folder():
         import subprocess
         import platform
         
-        # Open folder based on operating system
+        # Open folder based on operating system; the file manager is not waited on
         if platform.system() == 'Darwin':  # macOS
-            subprocess.run(['open', folder_path])
+            opener = 'open'
         elif platform.system() == 'Windows':
-            subprocess.run(['explorer', folder_path])
+            opener = 'explorer'
         else:  # Linux
-            subprocess.run(['xdg-open', folder_path])
+            opener = 'xdg-open'
+        subprocess.Popen([opener, folder_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         
         return jsonify({
             'success': True,
@@ -129,8 +130,7 @@ def test_directory():
     
     try:
         # Use FileOperationsService to test directory
-        file_service = FileOperationsService()
-        result = file_service.test_directory_access(directory_path)
+        result = shared_service(FileOperationsService).test_directory_access(directory_path)
         
         return jsonify({
             'success': True,
@@ -226,9 +226,7 @@ def restore_file(dataflow_id):
             return jsonify({'error': 'No dataset path found'}), 404
         
         # Use GitOperationsService to restore file
-        from ...services.git_operations import GitOperationsService
-        git_service = GitOperationsService()
-        result = git_service.restore_file_to_commit(dataset_path, file_path, commit_hash)
+        result = shared_service(GitOperationsService).restore_file_to_commit(dataset_path, file_path, commit_hash)
         
         if result.get('success'):
             return jsonify({
@@ -263,9 +261,7 @@ def get_file_commit_history(dataflow_id):
             return jsonify({'error': 'No dataset path found'}), 404
         
         # Use GitOperationsService to get file commit history
-        from ...services.git_operations import GitOperationsService
-        git_service = GitOperationsService()
-        commit_history = git_service.get_file_commit_history(dataset_path, file_path)
+        commit_history = shared_service(GitOperationsService).get_file_commit_history(dataset_path, file_path)
         
         return jsonify({
             'success': True,
@@ -4,23 +4,132 @@ Git API routes for SciTrace
 Handles git operations and version control functionality for datasets.
 """
 
-from flask import Blueprint, jsonify, request
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+from flask import Blueprint, jsonify, request, Response, stream_with_context, g
 from flask_login import login_required, current_user
 
-from ...models import Dataflow
-from ...services import GitOperationsService
+from ...services import GitOperationsService, shared_service
+from ...services.background_jobs import get_job, start_job
+from ...exceptions import GitOperationError, ValidationError
+from ...utils.auth_helpers import require_dataflow_api_access
 
 bp = Blueprint('git_api', __name__, url_prefix='/api')
 
+# Background jobs for mutating git operations (revert/checkout/branch);
+# their state lives in the job store, so any worker can answer a poll
+JOB_WORKERS = 4
+_JOB_EXECUTOR = ThreadPoolExecutor(max_workers=JOB_WORKERS)
+
+
+# Diff and source payloads compress well; tiny bodies are not worth the CPU
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 5
+
+
+def _json(payload, status=200):
+    """
+    Serialize a plain dict/list payload straight to a JSON response, skipping jsonify.
+    
+    Bodies of at least COMPRESS_MIN_SIZE bytes are gzipped when the client accepts it.
+    
+    Args:
+        payload: JSON-serializable data
+        status: HTTP status code
+    
+    Returns:
+        Flask Response object
+    """
+    body = orjson.dumps(payload)
+    response = Response(status=status, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    
+    if len(body) >= COMPRESS_MIN_SIZE and request.accept_encodings['gzip'] > 0:
+        body = gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+        response.headers['Content-Encoding'] = 'gzip'
+    
+    response.set_data(body)
+    return response
+
+
+def _stream_json_list(key, first, rest, flush_size=65536):
+    """
+    Stream ``{"success": true, key: [...]}`` without materializing the list.
+    
+    Args:
+        key: Name of the list field
+        first: First item, already pulled so errors surface before streaming
+        rest: Iterator over the remaining items
+        flush_size: Buffered bytes written per chunk
+    
+    Returns:
+        Flask Response object
+    """
+    def generate():
+        buffer = bytearray(b'{"success":true,' + orjson.dumps(key) + b':[')
+        try:
+            if first is not None:
+                buffer += orjson.dumps(first)
+                for item in rest:
+                    buffer += b','
+                    buffer += orjson.dumps(item)
+                    if len(buffer) >= flush_size:
+                        yield bytes(buffer)
+                        buffer.clear()
+            buffer += b']}'
+            yield bytes(buffer)
+        finally:
+            rest.close()
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+def _run_git_operation(operation, args, success_message, failure_message):
+    """Run a git operation for a background job, raising if it reports failure."""
+    result = operation(*args)
+    if not result.get('success'):
+        raise GitOperationError(result.get('error', failure_message))
+    
+    return {
+        'success': True,
+        'message': success_message,
+        'output': result.get('output', '')
+    }
+
+
+def _submit_git_job(operation, args, success_message, failure_message):
+    """
+    Queue a git operation and return a 202 response carrying its job id.
+    
+    Args:
+        operation: GitOperationsService method to run
+        args: Positional arguments for the operation
+        success_message: Message reported when the operation succeeds
+        failure_message: Fallback error when the operation reports no error
+    
+    Returns:
+        Flask response tuple with the job id and polling URL
+    """
+    job_id, _ = start_job('git', _JOB_EXECUTOR, _run_git_operation,
+                          operation, args, success_message, failure_message,
+                          user_id=current_user.id)
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': 'running',
+        'status_url': f'/api/git-operations/jobs/{job_id}'
+    }), 202
+
+
 @bp.route('/dataflows/<int:dataflow_id>/git-log', methods=['GET'])
 @login_required
+@require_dataflow_api_access
 def get_git_log(dataflow_id):
     """Get git log for a dataflow's dataset."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        return jsonify({'error': 'Access denied'}), 403
+    dataflow = g.dataflow
     
     try:
         # Get dataset path
@@ -28,30 +137,31 @@ def get_git_log(dataflow_id):
         if not dataset_path:
             return jsonify({'error': 'No dataset path found'}), 404
         
-        # Get limit from query parameters
+        # Get limit and optional pagination cursor from query parameters
         limit = request.args.get('limit', 20, type=int)
+        cursor = request.args.get('cursor')
         
         # Use GitOperationsService to get git log
-        git_service = GitOperationsService()
-        git_log = git_service.get_detailed_git_log(dataset_path, limit)
+        git_log = shared_service(GitOperationsService).get_detailed_git_log(dataset_path, limit, before_sha=cursor)
         
-        return jsonify({
+        return _json({
             'success': True,
-            'git_log': git_log
+            'git_log': git_log,
+            'next_cursor': git_log[-1]['full_hash'] if len(git_log) == limit else None
         })
         
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/dataflows/<int:dataflow_id>/commit-files/<commit_hash>', methods=['GET'])
 @login_required
+@require_dataflow_api_access
 def get_commit_files(dataflow_id, commit_hash):
     """Get files changed in a specific commit."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        return jsonify({'error': 'Access denied'}), 403
+    dataflow = g.dataflow
     
     try:
         # Get dataset path
@@ -59,27 +169,21 @@ def get_commit_files(dataflow_id, commit_hash):
         if not dataset_path:
             return jsonify({'error': 'No dataset path found'}), 404
         
-        # Use GitOperationsService to get commit files
-        git_service = GitOperationsService()
-        commit_files = git_service.get_commit_files(dataset_path, commit_hash)
+        # Stream commit files; pulling the first one surfaces git errors before the response starts
+        commit_files = shared_service(GitOperationsService).iter_commit_files(dataset_path, commit_hash)
+        first = next(commit_files, None)
         
-        return jsonify({
-            'success': True,
-            'commit_files': commit_files
-        })
+        return _stream_json_list('commit_files', first, commit_files)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/dataflows/<int:dataflow_id>/commit-file-content/<commit_hash>', methods=['GET'])
 @login_required
+@require_dataflow_api_access
 def get_commit_file_content(dataflow_id, commit_hash):
     """Get content of a specific file at a specific commit."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        return jsonify({'error': 'Access denied'}), 403
+    dataflow = g.dataflow
     
     file_path = request.args.get('file_path')
     if not file_path:
@@ -91,11 +195,15 @@ def get_commit_file_content(dataflow_id, commit_hash):
         if not dataset_path:
             return jsonify({'error': 'No dataset path found'}), 404
         
+        # Raw mode streams the blob straight from git instead of buffering it into JSON
+        if request.args.get('raw', type=int) == 1:
+            chunks = shared_service(GitOperationsService).stream_file_content_at_commit(dataset_path, commit_hash, file_path)
+            return Response(stream_with_context(chunks), mimetype='application/octet-stream')
+        
         # Use GitOperationsService to get file content
-        git_service = GitOperationsService()
-        file_content = git_service.get_file_content_at_commit(dataset_path, commit_hash, file_path)
+        file_content = shared_service(GitOperationsService).get_file_content_at_commit(dataset_path, commit_hash, file_path)
         
-        return jsonify({
+        return _json({
             'success': True,
             'file_content': file_content,
             'file_path': file_path,
@@ -107,13 +215,10 @@ def get_commit_file_content(dataflow_id, commit_hash):
 
 @bp.route('/dataflows/<int:dataflow_id>/git-operations/revert', methods=['POST'])
 @login_required
+@require_dataflow_api_access
 def revert_commit(dataflow_id):
     """Revert a specific commit."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        return jsonify({'error': 'Access denied'}), 403
+    dataflow = g.dataflow
     
     data = request.get_json()
     commit_hash = data.get('commit_hash')
@@ -128,31 +233,23 @@ def revert_commit(dataflow_id):
         if not dataset_path:
             return jsonify({'error': 'No dataset path found'}), 404
         
-        # Use GitOperationsService to revert commit
-        git_service = GitOperationsService()
-        result = git_service.revert_commit(dataset_path, commit_hash, commit_message)
-        
-        if result.get('success'):
-            return jsonify({
-                'success': True,
-                'message': f'Commit {commit_hash} has been reverted',
-                'output': result.get('output', '')
-            })
-        else:
-            return jsonify({'error': result.get('error', 'Failed to revert commit')}), 500
+        # Revert in the background; the client polls the job status
+        return _submit_git_job(
+            shared_service(GitOperationsService).revert_commit,
+            (dataset_path, commit_hash, commit_message),
+            f'Commit {commit_hash} has been reverted',
+            'Failed to revert commit'
+        )
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/dataflows/<int:dataflow_id>/git-operations/checkout', methods=['POST'])
 @login_required
+@require_dataflow_api_access
 def checkout_commit(dataflow_id):
     """Checkout a specific commit."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        return jsonify({'error': 'Access denied'}), 403
+    dataflow = g.dataflow
     
     data = request.get_json()
     commit_hash = data.get('commit_hash')
@@ -166,31 +263,39 @@ def checkout_commit(dataflow_id):
         if not dataset_path:
             return jsonify({'error': 'No dataset path found'}), 404
         
-        # Use GitOperationsService to checkout commit
-        git_service = GitOperationsService()
-        result = git_service.checkout_commit(dataset_path, commit_hash)
-        
-        if result.get('success'):
-            return jsonify({
-                'success': True,
-                'message': f'Checked out commit {commit_hash}',
-                'output': result.get('output', '')
-            })
-        else:
-            return jsonify({'error': result.get('error', 'Failed to checkout commit')}), 500
+        # Checkout in the background; the client polls the job status
+        return _submit_git_job(
+            shared_service(GitOperationsService).checkout_commit,
+            (dataset_path, commit_hash),
+            f'Checked out commit {commit_hash}',
+            'Failed to checkout commit'
+        )
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/git-operations/jobs/<job_id>', methods=['GET'])
+@login_required
+def get_git_job(job_id):
+    """Get the status of a background git operation."""
+    job = get_job(job_id, 'git')
+    if not job or job['user_id'] != current_user.id:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    response = {'job_id': job_id, 'status': job['status']}
+    if job['status'] == 'done':
+        response.update(job['result'])
+    elif job['status'] == 'failed':
+        response['error'] = job['error']
+    
+    return jsonify(response)
+
 @bp.route('/dataflows/<int:dataflow_id>/git-operations/commit-files', methods=['GET'])
 @login_required
+@require_dataflow_api_access
 def get_commit_files_git_ops(dataflow_id):
     """Get files changed in a specific commit (git operations endpoint)."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        return jsonify({'error': 'Access denied'}), 403
+    dataflow = g.dataflow
     
     commit_hash = request.args.get('commit_hash')
     if not commit_hash:
@@ -202,27 +307,21 @@ def get_commit_files_git_ops(dataflow_id):
         if not dataset_path:
             return jsonify({'error': 'No dataset path found'}), 404
         
-        # Use GitOperationsService to get commit files
-        git_service = GitOperationsService()
-        commit_files = git_service.get_commit_files(dataset_path, commit_hash)
+        # Stream commit files; pulling the first one surfaces git errors before the response starts
+        commit_files = shared_service(GitOperationsService).iter_commit_files(dataset_path, commit_hash)
+        first = next(commit_files, None)
         
-        return jsonify({
-            'success': True,
-            'commit_files': commit_files
-        })
+        return _stream_json_list('commit_files', first, commit_files)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/dataflows/<int:dataflow_id>/git-operations/file-diff', methods=['GET'])
 @login_required
+@require_dataflow_api_access
 def get_file_diff_git_ops(dataflow_id):
     """Get diff for a specific file at a specific commit."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        return jsonify({'error': 'Access denied'}), 403
+    dataflow = g.dataflow
     
     commit_hash = request.args.get('commit_hash')
     file_path = request.args.get('file_path')
@@ -237,10 +336,9 @@ def get_file_diff_git_ops(dataflow_id):
             return jsonify({'error': 'No dataset path found'}), 404
         
         # Use GitOperationsService to get file diff
-        git_service = GitOperationsService()
-        file_diff = git_service.get_file_diff(dataset_path, commit_hash, file_path)
+        file_diff = shared_service(GitOperationsService).get_file_diff(dataset_path, commit_hash, file_path)
         
-        return jsonify({
+        return _json({
             'success': True,
             'file_diff': file_diff,
             'file_path': file_path,
@@ -252,13 +350,10 @@ def get_file_diff_git_ops(dataflow_id):
 
 @bp.route('/dataflows/<int:dataflow_id>/git-operations/branch', methods=['POST'])
 @login_required
+@require_dataflow_api_access
 def create_branch_git_ops(dataflow_id):
     """Create a new branch from a specific commit."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        return jsonify({'error': 'Access denied'}), 403
+    dataflow = g.dataflow
     
     data = request.get_json()
     commit_hash = data.get('commit_hash')
@@ -273,31 +368,23 @@ def create_branch_git_ops(dataflow_id):
         if not dataset_path:
             return jsonify({'error': 'No dataset path found'}), 404
         
-        # Use GitOperationsService to create branch
-        git_service = GitOperationsService()
-        result = git_service.create_branch_from_commit(dataset_path, commit_hash, branch_name)
-        
-        if result.get('success'):
-            return jsonify({
-                'success': True,
-                'message': f'Branch {branch_name} created from commit {commit_hash}',
-                'output': result.get('output', '')
-            })
-        else:
-            return jsonify({'error': result.get('error', 'Failed to create branch')}), 500
+        # Create the branch in the background; the client polls the job status
+        return _submit_git_job(
+            shared_service(GitOperationsService).create_branch_from_commit,
+            (dataset_path, commit_hash, branch_name),
+            f'Branch {branch_name} created from commit {commit_hash}',
+            'Failed to create branch'
+        )
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/dataflows/<int:dataflow_id>/git-operations/compare', methods=['GET'])
 @login_required
+@require_dataflow_api_access
 def compare_commit_git_ops(dataflow_id):
     """Compare a commit with the current working directory."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        return jsonify({'error': 'Access denied'}), 403
+    dataflow = g.dataflow
     
     commit_hash = request.args.get('commit_hash')
     if not commit_hash:
@@ -310,8 +397,7 @@ def compare_commit_git_ops(dataflow_id):
             return jsonify({'error': 'No dataset path found'}), 404
         
         # Use GitOperationsService to compare commit
-        git_service = GitOperationsService()
-        comparison = git_service.compare_commit_to_local(dataset_path, commit_hash)
+        comparison = shared_service(GitOperationsService).compare_commit_to_local(dataset_path, commit_hash)
         
         return jsonify({
             'success': True,
@@ -324,13 +410,10 @@ def compare_commit_git_ops(dataflow_id):
 
 @bp.route('/dataflows/<int:dataflow_id>/git-operations/current-branch', methods=['GET'])
 @login_required
+@require_dataflow_api_access
 def get_current_branch(dataflow_id):
     """Get the current branch name."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        return jsonify({'error': 'Access denied'}), 403
+    dataflow = g.dataflow
     
     try:
         # Get dataset path
@@ -339,8 +422,7 @@ def get_current_branch(dataflow_id):
             return jsonify({'error': 'No dataset path found'}), 404
         
         # Use GitOperationsService to get current branch
-        git_service = GitOperationsService()
-        current_branch = git_service.get_current_branch(dataset_path)
+        current_branch = shared_service(GitOperationsService).get_current_branch(dataset_path)
         
         return jsonify({
             'success': True,
@@ -352,13 +434,10 @@ def get_current_branch(dataflow_id):
 
 @bp.route('/dataflows/<int:dataflow_id>/git-tree', methods=['GET'])
 @login_required
+@require_dataflow_api_access
 def get_git_tree(dataflow_id):
     """Get git tree structure for a dataflow's dataset."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        return jsonify({'error': 'Access denied'}), 403
+    dataflow = g.dataflow
     
     try:
         # Get dataset path
@@ -366,17 +445,21 @@ def get_git_tree(dataflow_id):
         if not dataset_path:
             return jsonify({'error': 'No dataset path found'}), 404
         
-        # Get limit from query parameters
+        # Get limit and optional pagination cursor from query parameters
         limit = request.args.get('limit', 20, type=int)
+        cursor = request.args.get('cursor')
         
         # Use GitOperationsService to get git tree
-        git_service = GitOperationsService()
-        git_tree = git_service.get_detailed_git_log(dataset_path, limit)
+        git_tree = shared_service(GitOperationsService).get_detailed_git_log(dataset_path, limit, before_sha=cursor)
         
-        return jsonify({
+        return _json({
             'success': True,
-            'commits': git_tree
+            'commits': git_tree,
+            'next_cursor': git_tree[-1]['full_hash'] if len(git_tree) == limit else None
         })
         
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -9,7 +9,7 @@ from flask_login import login_required, current_user
 import os
 
 from ...models import db, Project, Task
-from ...services import DatasetCreationService, FileOperationsService
+from ...services import DatasetCreationService, FileOperationsService, shared_service
 
 bp = Blueprint('project_api', __name__, url_prefix='/api')
 
@@ -55,8 +55,7 @@ def get_dataset_info(project_id):
     
     try:
         # Use DatasetCreationService to get dataset info
-        dataset_service = DatasetCreationService()
-        dataset_info = dataset_service.get_dataset_info(project.dataset_path)
+        dataset_info = shared_service(DatasetCreationService).get_dataset_info(project.dataset_path)
         
         return jsonify({
             'success': True,
@@ -84,8 +83,7 @@ def get_project_file_tree(project_id):
             return jsonify({'error': 'No dataset path found'}), 404
         
         # Use FileOperationsService to get file tree
-        file_service = FileOperationsService()
-        file_tree = file_service.get_file_tree(dataset_path)
+        file_tree = shared_service(FileOperationsService).get_file_tree(dataset_path)
         
         return jsonify({
             'success': True,
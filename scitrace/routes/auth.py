@@ -4,17 +4,64 @@ Authentication routes for SciTrace
 Handles user login, logout, and authentication.
 """
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
 from flask_login import login_user, logout_user, login_required, current_user
-from werkzeug.security import check_password_hash, generate_password_hash
-from datetime import datetime
-import subprocess
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import signal
 import os
 
 from ..models import User, db
 
 bp = Blueprint('auth', __name__, url_prefix='/auth')
 
+# Argon2id hasher used for all new password hashes
+_PH = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1)
+
+# Verified against when the username is unknown so both login paths cost the same
+_DUMMY_HASH = _PH.hash('not-a-real-password')
+
+# Background executor for login bookkeeping writes the user doesn't wait on
+_LOGIN_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+
+def _bg_touch_login(app, user_id, values):
+    """Persist login bookkeeping (last_login, migrated hash) outside the request."""
+    with app.app_context():
+        try:
+            User.query.filter_by(id=user_id).update(values)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"Could not record login for user {user_id}: {e}")
+
+
+def _verify_password(user, password):
+    """
+    Verify a password against the user's stored hash.
+    
+    Legacy Werkzeug hashes are rehashed with Argon2 on successful login so
+    existing accounts migrate transparently; the caller persists the new hash.
+    """
+    if user.password_hash.startswith('$argon2'):
+        try:
+            _PH.verify(user.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+        if _PH.check_needs_rehash(user.password_hash):
+            user.password_hash = _PH.hash(password)
+        return True
+    
+    if check_password_hash(user.password_hash, password):
+        user.password_hash = _PH.hash(password)
+        return True
+    return False
+
+
 @bp.route('/login', methods=['GET', 'POST'])
 def login():
     """Handle user login."""
@@ -27,10 +74,23 @@ def login():
         
         user = User.query.filter_by(username=username).first()
         
-        if user and check_password_hash(user.password_hash, password):
+        if user:
+            authenticated = _verify_password(user, password)
+        else:
+            # Spend the same hashing work as a real check to avoid a timing oracle
+            try:
+                _PH.verify(_DUMMY_HASH, password or '')
+            except VerificationError:
+                pass
+            authenticated = False
+        
+        if authenticated:
             login_user(user)
-            user.last_login = datetime.utcnow()
-            db.session.commit()
+            
+            values = {'last_login': datetime.now(timezone.utc)}
+            if db.inspect(user).attrs.password_hash.history.has_changes():
+                values['password_hash'] = user.password_hash
+            _LOGIN_EXECUTOR.submit(_bg_touch_login, current_app._get_current_object(), user.id, values)
             
             next_page = request.args.get('next')
             if not next_page or not next_page.startswith('/'):
@@ -70,7 +130,7 @@ def register():
                 username=username,
                 email=email,
                 name=name,
-                password_hash=generate_password_hash(password),
+                password_hash=_PH.hash(password),
                 role='user'
             )
             db.session.add(user)
@@ -97,24 +157,18 @@ def profile():
 @bp.route('/shutdown', methods=['POST'])
 @login_required
 def shutdown():
-    """Shutdown the Flask application using stop_flask.py script."""
+    """Shutdown the Flask application by signalling the server process."""
     try:
-        # Get the project root directory
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        stop_script_path = os.path.join(project_root, 'stop_flask.py')
-        
-        # Check if the script exists
-        if not os.path.exists(stop_script_path):
-            return jsonify({'success': False, 'message': 'Stop script not found'}), 500
+        # Under Gunicorn the master owns the workers, so signal it instead of this worker
+        if request.environ.get('SERVER_SOFTWARE', '').startswith('gunicorn'):
+            target_pid = os.getppid()
+        else:
+            target_pid = os.getpid()
         
-        # Execute the stop script
-        result = subprocess.run(['python3', stop_script_path], 
-                              capture_output=True, text=True, cwd=project_root)
+        # Send the signal after a short delay so this response is delivered first
+        threading.Timer(0.1, os.kill, args=(target_pid, signal.SIGTERM)).start()
         
-        if result.returncode == 0:
-            return jsonify({'success': True, 'message': 'Flask application shutdown initiated'})
-        else:
-            return jsonify({'success': False, 'message': f'Error: {result.stderr}'}), 500
+        return jsonify({'success': True, 'message': 'Flask application shutdown initiated'})
             
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
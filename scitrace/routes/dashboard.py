@@ -4,24 +4,78 @@ Dashboard routes for SciTrace
 Handles the main dashboard view with project and task overview.
 """
 
-from flask import Blueprint, render_template, jsonify, flash
+from flask import Blueprint, render_template, jsonify, flash, request
 from flask_login import login_required, current_user
 import os
+import json
+import time
+import hashlib
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
-from ..services import ProjectService
+from ..services import ProjectService, shared_service
 
 bp = Blueprint('dashboard', __name__)
 
+# Upper bound on concurrent dataset directory removals during reset
+MAX_RESET_WORKERS = 8
+
+# Per-user cache of serialized dashboard data: user_id -> (timestamp, data, etag)
+DASHBOARD_CACHE_TTL = 5
+_DASH_CACHE = {}
+
+
+def invalidate_dashboard_cache(user_id):
+    """Drop the cached dashboard data for a user after a write."""
+    _DASH_CACHE.pop(user_id, None)
+
+
+def _serialize_dashboard_data(data):
+    """Convert dashboard data into a JSON-serializable dict."""
+    def _iso(value):
+        return value.isoformat() if value else None
+    
+    return {
+        'projects': [{
+            'id': p.id,
+            'project_id': p.project_id,
+            'name': p.name,
+            'status': p.status,
+            'created_at': _iso(p.created_at)
+        } for p in data['projects']],
+        'tasks': [{
+            'id': t.id,
+            'title': t.title,
+            'project_id': t.project_id,
+            'status': t.status,
+            'priority': t.priority,
+            'deadline': _iso(t.deadline)
+        } for t in data['tasks']],
+        'dataflows': [{
+            'id': d.id,
+            'name': d.name,
+            'project_id': d.project_id,
+            'created_at': _iso(d.created_at)
+        } for d in data['dataflows']],
+        'stats': data['stats']
+    }
+
+
+def _remove_dataset_directory(dataset_path):
+    """Remove a dataset directory, returning an error message on failure."""
+    try:
+        shutil.rmtree(dataset_path)
+        return None
+    except Exception as e:
+        return f"Could not delete dataset directory {dataset_path}: {e}"
+
 @bp.route('/')
 @bp.route('/dashboard')
 @login_required
 def index():
     """Show the main dashboard."""
-    project_service = ProjectService()
-    
     try:
-        dashboard_data = project_service.get_project_dashboard_data(current_user.id)
+        dashboard_data = shared_service(ProjectService).get_project_dashboard_data(current_user.id)
         
         # Get recent tasks and projects for display
         recent_tasks = dashboard_data['tasks'][:5]  # Show last 5 tasks
@@ -49,13 +103,25 @@ def index():
 @login_required
 def dashboard_data():
     """API endpoint to get dashboard data."""
-    project_service = ProjectService()
+    cached = _DASH_CACHE.get(current_user.id)
+    if cached and time.time() - cached[0] < DASHBOARD_CACHE_TTL:
+        _, data, etag = cached
+    else:
+        try:
+            data = _serialize_dashboard_data(shared_service(ProjectService).get_project_dashboard_data(current_user.id))
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+        
+        etag = hashlib.blake2b(json.dumps(data, sort_keys=True).encode(), digest_size=8).hexdigest()
+        _DASH_CACHE[current_user.id] = (time.time(), data, etag)
     
-    try:
-        data = project_service.get_project_dashboard_data(current_user.id)
-        return jsonify(data)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    if request.if_none_match.contains(etag):
+        return '', 304
+    
+    response = jsonify(data)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'private, max-age={DASHBOARD_CACHE_TTL}'
+    return response
 
 @bp.route('/reset', methods=['POST'])
 @login_required
@@ -67,32 +133,31 @@ def reset_data():
         # Get all projects for the current user
         user_projects = Project.query.filter_by(admin_id=current_user.id).all()
         
-        # Delete physical DataLad datasets first
-        for project in user_projects:
-            if project.dataset_path and os.path.exists(project.dataset_path):
-                try:
-                    # Remove the entire dataset directory
-                    shutil.rmtree(project.dataset_path)
-                    print(f"Deleted dataset directory: {project.dataset_path}")
-                except Exception as e:
-                    print(f"Warning: Could not delete dataset directory {project.dataset_path}: {e}")
-        
-        # Delete all tasks for these projects
-        for project in user_projects:
-            Task.query.filter_by(project_id=project.id).delete()
-        
-        # Delete all dataflows for these projects
-        for project in user_projects:
-            Dataflow.query.filter_by(project_id=project.id).delete()
+        # Delete physical DataLad datasets first; removals are I/O-bound so
+        # run them concurrently (the DB session below stays single-threaded)
+        dataset_paths = [p.dataset_path for p in user_projects
+                         if p.dataset_path and os.path.exists(p.dataset_path)]
+        errors = []
+        if dataset_paths:
+            with ThreadPoolExecutor(max_workers=min(MAX_RESET_WORKERS, len(dataset_paths))) as executor:
+                errors = [error for error in executor.map(_remove_dataset_directory, dataset_paths) if error]
         
-        # Delete all projects for the current user
-        Project.query.filter_by(admin_id=current_user.id).delete()
+        # Delete tasks, dataflows and projects with one statement each
+        project_ids = [p.id for p in user_projects]
+        if project_ids:
+            Task.query.filter(Task.project_id.in_(project_ids)).delete(synchronize_session=False)
+            Dataflow.query.filter(Dataflow.project_id.in_(project_ids)).delete(synchronize_session=False)
+        Project.query.filter_by(admin_id=current_user.id).delete(synchronize_session=False)
         
         # Commit the changes
         db.session.commit()
+        invalidate_dashboard_cache(current_user.id)
         
         flash('All projects, dataflows, and datasets have been reset successfully!', 'success')
-        return jsonify({'success': True, 'message': 'Data reset successfully'})
+        response = {'success': True, 'message': 'Data reset successfully'}
+        if errors:
+            response['warnings'] = errors
+        return jsonify(response)
         
     except Exception as e:
         db.session.rollback()
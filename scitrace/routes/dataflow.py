@@ -4,32 +4,178 @@ Dataflow routes for SciTrace
 Handles dataflow creation, visualization, and management.
 """
 
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, abort
 from flask_login import login_required, current_user
+from sqlalchemy.orm import contains_eager, load_only
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 
 from ..models import Dataflow, Project, db
-from ..services import DatasetCreationService, MetadataOperationsService
+from ..services import DatasetCreationService, MetadataOperationsService, shared_service
+from ..services.background_jobs import get_job, start_job
+from ..utils.auth_helpers import get_owned_project_or_404, get_owned_dataflow_or_404
+from .dashboard import invalidate_dashboard_cache
 
 bp = Blueprint('dataflow', __name__, url_prefix='/dataflow')
 
+# Dataflows shown per page on the dataflow list
+DATAFLOWS_PER_PAGE = 30
+
+# Rows fetched per round trip when streaming dataflow lists into a template
+DATAFLOW_LIST_BATCH = 100
+
+# Background jobs for dataflows that need a new dataset; creating one runs
+# DataLad and git and can take several seconds
+DATAFLOW_JOB_WORKERS = 2
+DATAFLOW_JOB_REFRESH_SECONDS = 2
+_DATAFLOW_EXECUTOR = ThreadPoolExecutor(max_workers=DATAFLOW_JOB_WORKERS)
+
+# Columns shown on the dataflow list pages; nodes and edges are left unloaded
+_DATAFLOW_LIST_COLUMNS = load_only(Dataflow.id, Dataflow.name, Dataflow.description,
+                                   Dataflow.project_id, Dataflow.created_at,
+                                   Dataflow.flow_metadata)
+
+
+def _dataset_dir_name(project_name):
+    """
+    Get the directory name used for a project's dataset.
+    
+    Args:
+        project_name: Project name
+    
+    Returns:
+        Directory name, e.g. ``my_project_dataset``
+    """
+    return f"{project_name.lower().replace(' ', '_')}_dataset"
+
+
+def _create_dataflow(project, name, description, storage_path, research_type='general'):
+    """
+    Create a dataflow for a project, creating the project's dataset first if needed.
+    
+    The new dataset path and the dataflow are committed together. If building
+    the dataflow fails after the dataset was created on disk, the dataset path
+    is still recorded so a retry does not trip over the existing directory.
+    
+    Args:
+        project: Project the dataflow belongs to
+        name: Dataflow name
+        description: Dataflow description
+        storage_path: Directory in which to create the dataset
+        research_type: Research type used to lay out a new dataset
+    
+    Returns:
+        The committed Dataflow
+    """
+    created_dataset_path = None
+    try:
+        # Create dataflow
+        dataflow = Dataflow(
+            name=name,
+            description=description,
+            project_id=project.id
+        )
+        
+        # Create dataset in the selected location if project doesn't have one
+        if not project.dataset_path:
+            dataset_path = os.path.join(storage_path, _dataset_dir_name(project.name))
+            
+            # Create the dataset with research type
+            shared_service(DatasetCreationService).create_dataset(dataset_path, project.name, research_type)
+            
+            # Update project with dataset path; committed together with the dataflow
+            project.dataset_path = dataset_path
+            created_dataset_path = dataset_path
+        
+        # Generate dataflow from dataset
+        dataflow_data = shared_service(MetadataOperationsService).create_dataflow_from_dataset(project.dataset_path)
+        
+        dataflow.set_nodes(dataflow_data['nodes'])
+        dataflow.set_edges(dataflow_data['edges'])
+        dataflow.set_metadata(dataflow_data['metadata'])
+        
+        db.session.add(dataflow)
+        db.session.commit()
+        return dataflow
+        
+    except Exception:
+        db.session.rollback()
+        if created_dataset_path:
+            project.dataset_path = created_dataset_path
+            db.session.commit()
+        raise
+
+
+def _run_dataflow_job(project_id, name, description, storage_path, research_type):
+    """Create a dataflow for a background job and return its ID."""
+    project = db.session.get(Project, project_id)
+    dataflow = _create_dataflow(project, name, description, storage_path, research_type)
+    return {'dataflow_id': dataflow.id}
+
+
+def _start_dataflow_creation(project, name, description, storage_path, research_type, form_url):
+    """
+    Create a dataflow, in the background if its project still needs a dataset.
+    
+    Args:
+        project: Project the dataflow belongs to
+        name: Dataflow name
+        description: Dataflow description
+        storage_path: Directory in which to create the dataset
+        research_type: Research type used to lay out a new dataset
+        form_url: URL of the form to return to on failure
+    
+    Returns:
+        Redirect to the new dataflow, the job status page or the form
+    """
+    if project.dataset_path:
+        # The dataset already exists, so building the dataflow is quick
+        try:
+            dataflow = _create_dataflow(project, name, description, storage_path, research_type)
+            invalidate_dashboard_cache(current_user.id)
+            
+            flash('Dataflow created successfully!', 'success')
+            return redirect(url_for('dataflow.view', dataflow_id=dataflow.id))
+            
+        except Exception as e:
+            flash(f'Error creating dataflow: {str(e)}', 'error')
+            return redirect(form_url)
+    
+    # Only one job may create a project's dataset at a time
+    job_id, started = start_job('dataflow', _DATAFLOW_EXECUTOR, _run_dataflow_job,
+                                project.id, name, description, storage_path, research_type,
+                                user_id=current_user.id, project_id=project.project_id,
+                                details={'name': name, 'form_url': form_url}, unique=True)
+    if not started:
+        flash('A dataset for this project is already being created', 'info')
+    return redirect(url_for('dataflow.job_status', job_id=job_id))
+
+
 @bp.route('/')
 @login_required
 def index():
     """Show all dataflows for the current user."""
-    # Get all projects for the current user
-    projects = Project.query.filter_by(admin_id=current_user.id).all()
+    # Get all projects for the current user; the page only shows their names and descriptions
+    projects = (Project.query
+                .options(load_only(Project.id, Project.name, Project.description))
+                .filter_by(admin_id=current_user.id)
+                .all())
     
-    # Get all dataflows for these projects
-    dataflows = []
-    for project in projects:
-        project_dataflows = Dataflow.query.filter_by(project_id=project.id).all()
-        dataflows.extend(project_dataflows)
+    # Get one page of dataflows for these projects in one joined query
+    pagination = (Dataflow.query
+                  .join(Dataflow.project)
+                  .options(contains_eager(Dataflow.project), _DATAFLOW_LIST_COLUMNS)
+                  .filter(Project.admin_id == current_user.id)
+                  .order_by(Project.id, Dataflow.id)
+                  .paginate(page=request.args.get('page', 1, type=int),
+                            per_page=DATAFLOWS_PER_PAGE, error_out=False))
     
     return render_template('dataflow/index.html',
-                         dataflows=dataflows,
+                         dataflows=pagination.items,
+                         pagination=pagination,
+                         pagination_endpoint='dataflow.index',
                          projects=projects,
                          user=current_user)
 
@@ -52,68 +198,57 @@ def create():
             flash('Storage location is required', 'error')
             return redirect(url_for('dataflow.create'))
         
-        # Check if user has access to the project
-        project = Project.query.get_or_404(project_id)
-        if project.admin_id != current_user.id:
+        # Check if user has access to the project, loading only what dataflow creation reads
+        project = (Project.query
+                   .options(load_only(Project.id, Project.name, Project.dataset_path))
+                   .filter_by(id=project_id, admin_id=current_user.id)
+                   .first())
+        if not project:
             flash('Access denied', 'error')
             return redirect(url_for('dataflow.create'))
         
-        try:
-            # Create dataflow
-            dataflow = Dataflow(
-                name=name,
-                description=description,
-                project_id=project_id
-            )
-            
-            # Create dataset in the selected location if project doesn't have one
-            if not project.dataset_path:
-                dataset_service = DatasetCreationService()
-                dataset_name = f"{project.name.lower().replace(' ', '_')}_dataset"
-                dataset_path = os.path.join(storage_path, dataset_name)
-                
-                # Create the dataset with research type
-                dataset_service.create_dataset(dataset_path, project.name, research_type)
-                
-                # Update project with dataset path
-                project.dataset_path = dataset_path
-                db.session.commit()
-            
-            # Generate dataflow from dataset
-            metadata_service = MetadataOperationsService()
-            dataflow_data = metadata_service.create_dataflow_from_dataset(project.dataset_path)
-            
-            dataflow.set_nodes(dataflow_data['nodes'])
-            dataflow.set_edges(dataflow_data['edges'])
-            dataflow.set_metadata(dataflow_data['metadata'])
-            
-            db.session.add(dataflow)
-            db.session.commit()
-            
-            flash('Dataflow created successfully!', 'success')
-            return redirect(url_for('dataflow.view', dataflow_id=dataflow.id))
-            
-        except Exception as e:
-            flash(f'Error creating dataflow: {str(e)}', 'error')
-            return redirect(url_for('dataflow.create'))
+        return _start_dataflow_creation(project, name, description, storage_path,
+                                        research_type, url_for('dataflow.create'))
     
-    # Get user's projects for the form
-    projects = Project.query.filter_by(admin_id=current_user.id).all()
+    # Get user's projects for the form; the picker needs names and dataset paths only
+    projects = (Project.query
+                .options(load_only(Project.id, Project.name, Project.dataset_path))
+                .filter_by(admin_id=current_user.id)
+                .all())
     
     return render_template('dataflow/create.html',
                          projects=projects,
                          user=current_user)
 
+@bp.route('/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    """Show progress of a background dataflow creation and redirect once it finishes."""
+    job = get_job(job_id, 'dataflow')
+    if not job or job['user_id'] != current_user.id:
+        abort(404)
+    
+    if job['status'] == 'done':
+        # The dataflow was committed by the job, after any dashboard the
+        # user loaded while waiting
+        invalidate_dashboard_cache(current_user.id)
+        flash('Dataflow created successfully!', 'success')
+        return redirect(url_for('dataflow.view', dataflow_id=job['result']['dataflow_id']))
+    
+    if job['status'] == 'failed':
+        flash(f"Error creating dataflow: {job['error']}", 'error')
+        return redirect(job['form_url'])
+    
+    return render_template('dataflow/job.html',
+                         job=job,
+                         refresh_seconds=DATAFLOW_JOB_REFRESH_SECONDS,
+                         user=current_user)
+
 @bp.route('/<int:dataflow_id>')
 @login_required
 def view(dataflow_id):
     """View a specific dataflow."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('dataflow.index'))
+    dataflow = get_owned_dataflow_or_404(dataflow_id)
     
     return render_template('dataflow/view.html',
                          dataflow=dataflow,
@@ -123,12 +258,7 @@ def view(dataflow_id):
 @login_required
 def git_log(dataflow_id):
     """View git log for a specific dataflow's dataset."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('dataflow.index'))
+    dataflow = get_owned_dataflow_or_404(dataflow_id)
     
     return render_template('dataflow/git_log.html',
                          dataflow=dataflow,
@@ -138,12 +268,7 @@ def git_log(dataflow_id):
 @login_required
 def edit(dataflow_id):
     """Edit a dataflow."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('dataflow.index'))
+    dataflow = get_owned_dataflow_or_404(dataflow_id)
     
     if request.method == 'POST':
         name = request.form.get('name')
@@ -175,16 +300,12 @@ def edit(dataflow_id):
 @login_required
 def delete(dataflow_id):
     """Delete a dataflow."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('dataflow.index'))
+    dataflow = get_owned_dataflow_or_404(dataflow_id)
     
     try:
         db.session.delete(dataflow)
         db.session.commit()
+        invalidate_dashboard_cache(current_user.id)
         
         flash('Dataflow deleted successfully!', 'success')
         return redirect(url_for('dataflow.index'))
@@ -197,15 +318,13 @@ def delete(dataflow_id):
 @login_required
 def project_dataflows(project_id):
     """Show all dataflows for a specific project."""
-    project = Project.query.get_or_404(project_id)
-    
-    # Check if user has access to this project
-    if project.admin_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('dataflow.index'))
+    project = get_owned_project_or_404(project_id)
     
-    # Get all dataflows for this project
-    dataflows = Dataflow.query.filter_by(project_id=project_id).all()
+    # Get all dataflows for this project, streamed in batches while the template renders
+    dataflows = (Dataflow.query
+                 .options(_DATAFLOW_LIST_COLUMNS)
+                 .filter_by(project_id=project_id)
+                 .yield_per(DATAFLOW_LIST_BATCH))
     
     return render_template('dataflow/index.html',
                          dataflows=dataflows,
@@ -216,12 +335,7 @@ def project_dataflows(project_id):
 @login_required
 def create_for_project(project_id):
     """Create a new dataflow for a specific project."""
-    project = Project.query.get_or_404(project_id)
-    
-    # Check if user has access to this project
-    if project.admin_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('dataflow.index'))
+    project = get_owned_project_or_404(project_id)
     
     if request.method == 'POST':
         name = request.form.get('name')
@@ -236,44 +350,8 @@ def create_for_project(project_id):
             flash('Storage location is required', 'error')
             return redirect(url_for('dataflow.create_for_project', project_id=project_id))
         
-        try:
-            # Create dataflow
-            dataflow = Dataflow(
-                name=name,
-                description=description,
-                project_id=project_id
-            )
-            
-            # Create dataset in the selected location if project doesn't have one
-            if not project.dataset_path:
-                dataset_service = DatasetCreationService()
-                dataset_name = f"{project.name.lower().replace(' ', '_')}_dataset"
-                dataset_path = os.path.join(storage_path, dataset_name)
-                
-                # Create the dataset
-                dataset_service.create_dataset(dataset_path, project.name)
-                
-                # Update project with dataset path
-                project.dataset_path = dataset_path
-                db.session.commit()
-            
-            # Generate dataflow from dataset
-            metadata_service = MetadataOperationsService()
-            dataflow_data = metadata_service.create_dataflow_from_dataset(project.dataset_path)
-            
-            dataflow.set_nodes(dataflow_data['nodes'])
-            dataflow.set_edges(dataflow_data['edges'])
-            dataflow.set_metadata(dataflow_data['metadata'])
-            
-            db.session.add(dataflow)
-            db.session.commit()
-            
-            flash('Dataflow created successfully!', 'success')
-            return redirect(url_for('dataflow.view', dataflow_id=dataflow.id))
-            
-        except Exception as e:
-            flash(f'Error creating dataflow: {str(e)}', 'error')
-            return redirect(url_for('dataflow.create_for_project', project_id=project_id))
+        return _start_dataflow_creation(project, name, description, storage_path, 'general',
+                                        url_for('dataflow.create_for_project', project_id=project_id))
     
     return render_template('dataflow/create.html',
                          project=project,
@@ -283,12 +361,7 @@ def create_for_project(project_id):
 @login_required
 def lifecycle_view(dataflow_id):
     """View the conceptual data lifecycle workflow for a dataflow."""
-    dataflow = Dataflow.query.get_or_404(dataflow_id)
-    
-    # Check if user has access to this dataflow
-    if dataflow.project.admin_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('dataflow.index'))
+    dataflow = get_owned_dataflow_or_404(dataflow_id)
     
     return render_template('dataflow/lifecycle.html',
                          dataflow=dataflow,
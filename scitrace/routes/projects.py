@@ -6,14 +6,32 @@ Handles project creation, management, and viewing.
 
 from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
 from flask_login import login_required, current_user
-from datetime import datetime
-import json
+import re
 
 from ..models import Project, Task, db
-from ..services import ProjectService
+from ..services import ProjectService, shared_service
+from ..utils.auth_helpers import get_owned_project_or_404
+from ..utils.validation_utils import parse_iso_datetime
+from .dashboard import invalidate_dashboard_cache
 
 bp = Blueprint('projects', __name__, url_prefix='/projects')
 
+# Separator in the comma-separated collaborators form field, with surrounding whitespace
+_COLLABORATOR_SEP_RE = re.compile(r'\s*,\s*')
+
+
+def _parse_collaborators(raw):
+    """
+    Split the collaborators form field into a list of names.
+    
+    Args:
+        raw: Comma-separated collaborators, e.g. ``"alice, bob"``
+    
+    Returns:
+        List of non-empty collaborator names
+    """
+    return [c for c in _COLLABORATOR_SEP_RE.split(raw.strip()) if c]
+
 @bp.route('/')
 @login_required
 def index():
@@ -37,15 +55,11 @@ def create():
             flash('Project name is required', 'error')
             return redirect(url_for('projects.create'))
         
-        project_service = ProjectService()
-        
         try:
             # Parse collaborators
-            collaborator_list = []
-            if collaborators:
-                collaborator_list = [c.strip() for c in collaborators.split(',') if c.strip()]
+            collaborator_list = _parse_collaborators(collaborators)
             
-            project_data = project_service.create_project(
+            project_data = shared_service(ProjectService).create_project(
                 name=name,
                 description=description,
                 admin_id=current_user.id,
@@ -58,13 +72,14 @@ def create():
                 name=project_data['name'],
                 description=project_data['description'],
                 admin_id=project_data['admin_id'],
-                collaborators=json.dumps(project_data['collaborators']),
+                collaborators=project_data['collaborators'],
                 dataset_path=project_data['dataset_path'],
                 status=project_data['status']
             )
             
             db.session.add(project)
             db.session.commit()
+            invalidate_dashboard_cache(current_user.id)
             
             flash('Project created successfully!', 'success')
             return redirect(url_for('projects.view', project_id=project.id))
@@ -79,12 +94,7 @@ def create():
 @login_required
 def view(project_id):
     """View a specific project."""
-    project = Project.query.get_or_404(project_id)
-    
-    # Check if user has access to this project
-    if project.admin_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('projects.index'))
+    project = get_owned_project_or_404(project_id)
     
     # Get project tasks
     tasks = Task.query.filter_by(project_id=project_id).all()
@@ -98,12 +108,7 @@ def view(project_id):
 @login_required
 def edit(project_id):
     """Edit a project."""
-    project = Project.query.get_or_404(project_id)
-    
-    # Check if user has access to this project
-    if project.admin_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('projects.index'))
+    project = get_owned_project_or_404(project_id)
     
     if request.method == 'POST':
         project.name = request.form.get('name', project.name)
@@ -112,8 +117,7 @@ def edit(project_id):
         
         collaborators = request.form.get('collaborators', '')
         if collaborators:
-            collaborator_list = [c.strip() for c in collaborators.split(',') if c.strip()]
-            project.collaborators = json.dumps(collaborator_list)
+            project.collaborators = _parse_collaborators(collaborators)
         
         db.session.commit()
         
@@ -128,12 +132,7 @@ def edit(project_id):
 @login_required
 def create_task(project_id):
     """Create a new task for a project."""
-    project = Project.query.get_or_404(project_id)
-    
-    # Check if user has access to this project
-    if project.admin_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('projects.index'))
+    project = get_owned_project_or_404(project_id)
     
     if request.method == 'POST':
         title = request.form.get('title')
@@ -149,7 +148,7 @@ def create_task(project_id):
         deadline = None
         if deadline_str:
             try:
-                deadline = datetime.fromisoformat(deadline_str.replace('Z', '+00:00'))
+                deadline = parse_iso_datetime(deadline_str)
             except ValueError:
                 flash('Invalid deadline format', 'error')
                 return redirect(url_for('projects.create_task', project_id=project_id))
@@ -166,6 +165,7 @@ def create_task(project_id):
         
         db.session.add(task)
         db.session.commit()
+        invalidate_dashboard_cache(current_user.id)
         
         flash('Task created successfully!', 'success')
         return redirect(url_for('projects.view', project_id=project_id))
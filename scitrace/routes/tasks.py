@@ -4,56 +4,82 @@ Tasks routes for SciTrace
 Handles task management and viewing across all projects.
 """
 
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, g
 from flask_login import login_required, current_user
-from datetime import datetime
+from sqlalchemy.orm import joinedload, load_only
+from datetime import datetime, timezone
 
 from ..models import Task, Project, db
+from ..utils.auth_helpers import get_owned_task_or_404
+from ..utils.validation_utils import parse_iso_datetime
+from .dashboard import invalidate_dashboard_cache
 
 bp = Blueprint('tasks', __name__, url_prefix='/tasks')
 
+# Tasks shown per page on the task list
+TASKS_PER_PAGE = 50
+
+# Upper bound on the number of tasks accepted by one bulk request
+BULK_TASKS_MAX = 1000
+TASK_PRIORITIES = ('low', 'medium', 'urgent')
+TASK_STATUSES = ('pending', 'ongoing', 'done')
+
+@bp.before_request
+def _read_request_time():
+    """Read the clock once per request; handlers use g.now."""
+    g.now = datetime.now(timezone.utc)
+
+def _naive_now():
+    """
+    Get the request time as a naive UTC datetime.
+    
+    Deadlines are loaded back from SQLite without tzinfo, so the templates
+    compare them against a naive value.
+    """
+    return g.now.replace(tzinfo=None)
+
 @bp.route('/')
 @login_required
 def index():
     """Show all tasks for the current user."""
-    # Get all tasks for the current user
-    tasks = Task.query.filter_by(user_id=current_user.id).order_by(Task.created_at.desc()).all()
+    # Get one page of the current user's tasks, newest first
+    pagination = (Task.query
+                  .options(joinedload(Task.project))
+                  .filter_by(user_id=current_user.id)
+                  .order_by(Task.created_at.desc(), Task.id.desc())
+                  .paginate(page=request.args.get('page', 1, type=int),
+                            per_page=TASKS_PER_PAGE, error_out=False))
     
-    # Get projects for context
-    projects = Project.query.filter_by(admin_id=current_user.id).all()
+    # Get projects for the filter dropdown
+    projects = (Project.query
+                .options(load_only(Project.id, Project.name))
+                .filter_by(admin_id=current_user.id)
+                .all())
     
     return render_template('tasks/index.html',
-                         tasks=tasks,
+                         tasks=pagination.items,
+                         pagination=pagination,
+                         pagination_endpoint='tasks.index',
                          projects=projects,
                          user=current_user,
-                         now=datetime.utcnow())
+                         now=_naive_now())
 
 @bp.route('/<int:task_id>')
 @login_required
 def view(task_id):
     """View a specific task."""
-    task = Task.query.get_or_404(task_id)
-    
-    # Check if user has access to this task
-    if task.user_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('tasks.index'))
+    task = get_owned_task_or_404(task_id, joinedload(Task.project))
     
     return render_template('tasks/view.html',
                          task=task,
                          user=current_user,
-                         now=datetime.utcnow())
+                         now=_naive_now())
 
 @bp.route('/<int:task_id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit(task_id):
     """Edit a task."""
-    task = Task.query.get_or_404(task_id)
-    
-    # Check if user has access to this task
-    if task.user_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('tasks.index'))
+    task = get_owned_task_or_404(task_id)
     
     if request.method == 'POST':
         title = request.form.get('title')
@@ -70,7 +96,7 @@ def edit(task_id):
         deadline = None
         if deadline_str:
             try:
-                deadline = datetime.fromisoformat(deadline_str.replace('Z', '+00:00'))
+                deadline = parse_iso_datetime(deadline_str)
             except ValueError:
                 flash('Invalid deadline format', 'error')
                 return redirect(url_for('tasks.edit', task_id=task_id))
@@ -80,7 +106,7 @@ def edit(task_id):
         task.deadline = deadline
         task.priority = priority
         task.status = status
-        task.updated_at = datetime.utcnow()
+        task.updated_at = g.now
         
         db.session.commit()
         
@@ -106,9 +132,11 @@ def create():
             flash('Task title and project are required', 'error')
             return redirect(url_for('tasks.create'))
         
-        # Check if user has access to the project
-        project = Project.query.get_or_404(project_id)
-        if project.admin_id != current_user.id:
+        # Check if user has access to the project; only the id is needed, not the row
+        owned_project_id = (db.session.query(Project.id)
+                            .filter_by(id=project_id, admin_id=current_user.id)
+                            .scalar())
+        if owned_project_id is None:
             flash('Access denied', 'error')
             return redirect(url_for('tasks.create'))
         
@@ -116,7 +144,7 @@ def create():
         deadline = None
         if deadline_str:
             try:
-                deadline = datetime.fromisoformat(deadline_str.replace('Z', '+00:00'))
+                deadline = parse_iso_datetime(deadline_str)
             except ValueError:
                 flash('Invalid deadline format', 'error')
                 return redirect(url_for('tasks.create'))
@@ -125,7 +153,7 @@ def create():
             title=title,
             description=description,
             user_id=current_user.id,
-            project_id=project_id,
+            project_id=owned_project_id,
             deadline=deadline,
             priority=priority,
             status='pending'
@@ -133,12 +161,16 @@ def create():
         
         db.session.add(task)
         db.session.commit()
+        invalidate_dashboard_cache(current_user.id)
         
         flash('Task created successfully!', 'success')
         return redirect(url_for('tasks.view', task_id=task.id))
     
-    # Get user's projects for the form
-    projects = Project.query.filter_by(admin_id=current_user.id).all()
+    # Get user's projects for the form; the picker only needs names
+    projects = (Project.query
+                .options(load_only(Project.id, Project.name))
+                .filter_by(admin_id=current_user.id)
+                .all())
     
     return render_template('tasks/create.html',
                          projects=projects,
@@ -148,15 +180,79 @@ def create():
 @login_required
 def delete(task_id):
     """Delete a task."""
-    task = Task.query.get_or_404(task_id)
-    
-    # Check if user has access to this task
-    if task.user_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('tasks.index'))
+    task = get_owned_task_or_404(task_id)
     
     db.session.delete(task)
     db.session.commit()
+    invalidate_dashboard_cache(current_user.id)
     
     flash('Task deleted successfully!', 'success')
     return redirect(url_for('tasks.index'))
+
+@bp.route('/bulk', methods=['POST'])
+@login_required
+def bulk_create():
+    """
+    Create many tasks from a JSON array in one INSERT.
+    
+    Each item needs ``title`` and ``project_id`` and may set ``description``,
+    ``deadline`` (ISO 8601), ``priority`` and ``status``. Nothing is inserted
+    unless every item is valid.
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Expected a non-empty JSON array of tasks'}), 400
+    if len(items) > BULK_TASKS_MAX:
+        return jsonify({'error': f'At most {BULK_TASKS_MAX} tasks can be created at once'}), 400
+    
+    owned_project_ids = {
+        project_id for (project_id,) in
+        db.session.query(Project.id).filter_by(admin_id=current_user.id)
+    }
+    
+    now = g.now
+    rows = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get('title'):
+            return jsonify({'error': f'Task {index}: title is required'}), 400
+        
+        try:
+            project_id = int(item.get('project_id'))
+        except (TypeError, ValueError):
+            return jsonify({'error': f'Task {index}: project_id is required'}), 400
+        if project_id not in owned_project_ids:
+            return jsonify({'error': f'Task {index}: access denied to project {project_id}'}), 403
+        
+        priority = item.get('priority', 'medium')
+        status = item.get('status', 'pending')
+        if priority not in TASK_PRIORITIES or status not in TASK_STATUSES:
+            return jsonify({'error': f'Task {index}: invalid priority or status'}), 400
+        
+        deadline = None
+        if item.get('deadline'):
+            try:
+                deadline = parse_iso_datetime(str(item['deadline']))
+            except ValueError:
+                return jsonify({'error': f'Task {index}: invalid deadline format'}), 400
+        
+        rows.append({
+            'title': item['title'],
+            'description': item.get('description', ''),
+            'user_id': current_user.id,
+            'project_id': project_id,
+            'deadline': deadline,
+            'priority': priority,
+            'status': status,
+            'created_at': now,
+            'updated_at': now
+        })
+    
+    try:
+        Task.bulk_insert(rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+    
+    invalidate_dashboard_cache(current_user.id)
+    return jsonify({'success': True, 'created': len(rows)}), 201
@@ -4,7 +4,7 @@ Services package for SciTrace
 This package contains service classes for business logic and data operations.
 """
 
-from .base_service import BaseService
+from .base_service import BaseService, shared_service
 from .project_service import ProjectService
 from .dataset_creation import DatasetCreationService
 from .file_operations import FileOperationsService
@@ -15,6 +15,7 @@ from .dataset_integration import DatasetIntegrationService
 
 __all__ = [
     'BaseService', 
+    'shared_service',
     'ProjectService', 
     'DatasetCreationService',
     'FileOperationsService',
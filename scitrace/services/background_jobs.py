@@ -0,0 +1,138 @@
+"""
+Background job store for SciTrace
+
+Records background jobs in the database, so a job started by one worker
+process can be polled from any other.
+"""
+
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+from flask import current_app
+from sqlalchemy import delete, insert, select, update
+
+from ..models import Job, db, dump_json_text
+
+# Finished jobs stay pollable this long
+JOB_RETENTION_SECONDS = 600
+
+# Jobs still running after this long were lost with their worker process
+JOB_STALE_SECONDS = 3600
+
+# Jobs are written on their own connection, so starting or finishing one
+# never commits or rolls back a caller's session
+_JOB_TABLE = Job.__table__
+
+# Serializes the running-job check and the insert within this process
+_START_LOCK = threading.Lock()
+
+
+def _prune_jobs(conn) -> None:
+    """Drop finished jobs older than JOB_RETENTION_SECONDS and fail stale running ones."""
+    now = datetime.now(timezone.utc)
+    conn.execute(delete(_JOB_TABLE).where(
+        _JOB_TABLE.c.status != 'running',
+        _JOB_TABLE.c.finished_at < now - timedelta(seconds=JOB_RETENTION_SECONDS)
+    ))
+    conn.execute(update(_JOB_TABLE).where(
+        _JOB_TABLE.c.status == 'running',
+        _JOB_TABLE.c.created_at < now - timedelta(seconds=JOB_STALE_SECONDS)
+    ).values(status='failed', error='The job was interrupted', finished_at=now))
+
+
+def start_job(kind: str, executor, func: Callable[..., Any], *args,
+              user_id: Optional[int] = None, project_id: Optional[str] = None,
+              details: Optional[Dict[str, Any]] = None,
+              unique: bool = False) -> Tuple[str, bool]:
+    """
+    Record a running job and run ``func(*args)`` for it in executor.
+    
+    The function runs inside an application context. Its return value becomes
+    the job result; an exception fails the job with its message.
+    
+    Args:
+        kind: Job kind, e.g. 'git', 'dataflow' or 'dataset'
+        executor: Executor the job runs in
+        func: Function doing the work
+        *args: Positional arguments for func
+        user_id: ID of the user allowed to poll the job
+        project_id: Project ID the job works on
+        details: JSON-serializable details returned with the job state
+        unique: Return the job of this kind already running for project_id
+            instead of starting another
+    
+    Returns:
+        Tuple of the job ID and whether a new job was started
+    """
+    job_id = uuid.uuid4().hex
+    with _START_LOCK, db.engine.begin() as conn:
+        _prune_jobs(conn)
+        
+        if unique:
+            running_id = conn.execute(select(_JOB_TABLE.c.id).where(
+                _JOB_TABLE.c.kind == kind,
+                _JOB_TABLE.c.project_id == project_id,
+                _JOB_TABLE.c.status == 'running'
+            ).limit(1)).scalar()
+            if running_id is not None:
+                return running_id, False
+        
+        conn.execute(insert(_JOB_TABLE).values(
+            id=job_id,
+            kind=kind,
+            user_id=user_id,
+            project_id=project_id,
+            status='running',
+            details=dump_json_text(details) if details else None
+        ))
+    
+    executor.submit(_run_job, current_app._get_current_object(), job_id, func, args)
+    return job_id, True
+
+
+def _run_job(app, job_id: str, func: Callable[..., Any], args: tuple) -> None:
+    """Run a job's function in the executor and record its outcome."""
+    with app.app_context():
+        try:
+            values = {'status': 'done', 'result': dump_json_text(func(*args))}
+        except Exception as e:
+            db.session.rollback()
+            values = {'status': 'failed', 'error': str(e)}
+        
+        values['finished_at'] = datetime.now(timezone.utc)
+        with db.engine.begin() as conn:
+            conn.execute(update(_JOB_TABLE).where(_JOB_TABLE.c.id == job_id).values(**values))
+
+
+def get_job(job_id: str, kind: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the state of a background job.
+    
+    Args:
+        job_id: Job ID returned by start_job
+        kind: Job kind the ID must belong to
+    
+    Returns:
+        Dict with the job's details, user_id, project_id and status
+        ('running', 'done' or 'failed'), plus its result or error once
+        finished; None if the job is unknown or expired
+    """
+    with db.engine.connect() as conn:
+        row = conn.execute(select(_JOB_TABLE).where(
+            _JOB_TABLE.c.id == job_id,
+            _JOB_TABLE.c.kind == kind
+        )).first()
+    
+    if row is None:
+        return None
+    
+    job = orjson.loads(row.details) if row.details else {}
+    job.update(job_id=row.id, user_id=row.user_id, project_id=row.project_id, status=row.status)
+    if row.status == 'done':
+        job['result'] = orjson.loads(row.result) if row.result else None
+    elif row.status == 'failed':
+        job['error'] = row.error
+    return job
@@ -5,9 +5,16 @@ Provides common database and error handling patterns for all services.
 """
 
 import logging
-from typing import Any, Dict, List, Optional, Type, TypeVar
-from sqlalchemy.orm import Session
+import threading
+from weakref import WeakKeyDictionary
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Type, TypeVar, Union
+from sqlalchemy import event, insert, update, delete, exists, inspect, literal_column, select, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import SQLAlchemyError
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
 
 from ..exceptions import (
@@ -21,6 +28,159 @@ ModelType = TypeVar('ModelType')
 
 logger = logging.getLogger(__name__)
 
+# Default number of rows per batch for bulk_create
+BULK_BATCH_SIZE = 10_000
+
+# Default number of rows fetched per batch by iter_raw_query
+RAW_QUERY_BATCH_SIZE = 1000
+
+# Fields checked by BaseService._validate_required_fields when a model maps them
+# This is a basic implementation - can be extended based on model requirements
+REQUIRED_FIELDS = ('name', 'title')
+
+# Mapped attributes per model class, filled on first use
+_MAPPED_ATTRS = WeakKeyDictionary()
+
+
+def _mapped_attrs(model_class: type) -> Dict[str, Any]:
+    """
+    Return the mapped attributes of a model class by name.
+    
+    Only columns and relationships count, so plain methods and properties
+    are never accepted as filter or update keys.
+    
+    Args:
+        model_class: The model class
+    
+    Returns:
+        Dictionary of attribute name to instrumented class attribute
+    """
+    attrs = _MAPPED_ATTRS.get(model_class)
+    if attrs is None:
+        attrs = {name: getattr(model_class, name) for name in inspect(model_class).attrs.keys()}
+        _MAPPED_ATTRS[model_class] = attrs
+    return attrs
+
+
+def _filter_conditions(model_class: type, filters: Dict[str, Any]) -> list:
+    """
+    Build equality conditions for the filters that name mapped attributes.
+    
+    Args:
+        model_class: The model class queried
+        filters: Attribute name to value; unknown names are ignored
+    
+    Returns:
+        List of SQL conditions, to be passed to a single filter()/where()
+    """
+    attrs = _mapped_attrs(model_class)
+    return [attrs[key] == value for key, value in filters.items() if key in attrs]
+
+
+def _required_fields(model_class: type) -> tuple:
+    """
+    Return the fields that must be present when creating a model instance.
+    
+    Args:
+        model_class: The model class
+    
+    Returns:
+        Tuple of the REQUIRED_FIELDS the model maps
+    """
+    attrs = _mapped_attrs(model_class)
+    return tuple(field for field in REQUIRED_FIELDS if field in attrs)
+
+
+# Attribute on flask.g holding the per-request lookup cache
+_REQUEST_CACHE_ATTR = '_scitrace_query_cache'
+
+# Sentinel for cache misses, since None and 0 are valid cached results
+_MISSING = object()
+
+
+def _request_cache(session) -> Optional[Dict[tuple, Any]]:
+    """
+    Return the lookup cache for the current app context.
+    
+    The cache is bypassed while the session holds unflushed changes, so the
+    lookup's query autoflushes them (clearing the cache) instead of a cached
+    result hiding them.
+    
+    Args:
+        session: Session the lookup runs in
+    
+    Returns:
+        Cache dictionary, or None outside an app context or while the
+        session has pending changes
+    """
+    if not has_app_context():
+        return None
+    if session.new or session.dirty or session.deleted:
+        return None
+    cache = g.get(_REQUEST_CACHE_ATTR)
+    if cache is None:
+        cache = {}
+        setattr(g, _REQUEST_CACHE_ATTR, cache)
+    return cache
+
+
+@event.listens_for(Session, 'after_flush')
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_soft_rollback')
+def _clear_request_cache(session, *args) -> None:
+    """Drop cached lookups once the session writes or rolls back, from any code path."""
+    if has_app_context():
+        g.pop(_REQUEST_CACHE_ATTR, None)
+
+
+def _filters_key(kind: str, model_class: type, filters: Dict[str, Any]) -> Optional[tuple]:
+    """
+    Build a cache key for a filtered lookup.
+    
+    Args:
+        kind: Name of the lookup ('exists' or 'count')
+        model_class: The model class queried
+        filters: Filters of the lookup
+    
+    Returns:
+        Hashable key, or None if a filter value is unhashable
+    """
+    try:
+        key = (kind, model_class, frozenset(filters.items()))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+# Process-wide service instances, keyed by class
+_SHARED_SERVICES = {}
+_SHARED_SERVICES_LOCK = threading.Lock()
+
+
+def shared_service(service_class: type):
+    """
+    Return the process-wide instance of a service class, building it on first use.
+    
+    Services keep no per-request state, so routes share one instance of each
+    instead of paying for DataLadUtils' availability check and the dataset
+    base directory setup on every request. Building on first use keeps those
+    side effects out of module import.
+    
+    Args:
+        service_class: Service class constructible without arguments
+    
+    Returns:
+        The shared instance
+    """
+    service = _SHARED_SERVICES.get(service_class)
+    if service is None:
+        with _SHARED_SERVICES_LOCK:
+            service = _SHARED_SERVICES.get(service_class)
+            if service is None:
+                service = _SHARED_SERVICES[service_class] = service_class()
+    return service
+
 
 class BaseService:
     """Base service class with common database and error handling patterns."""
@@ -46,7 +206,7 @@ class BaseService:
         Raises:
             DatabaseError: Standardized database error
         """
-        self.logger.error(f"Database error during {operation}: {str(error)}", exc_info=error)
+        self.logger.error("Database error during %s: %s", operation, error, exc_info=error)
         raise DatabaseError(
             message=f"Database operation failed: {operation}",
             operation=operation,
@@ -64,7 +224,7 @@ class BaseService:
         Raises:
             ServiceError: Standardized service error
         """
-        self.logger.error(f"Service error during {operation}: {str(error)}", exc_info=error)
+        self.logger.error("Service error during %s: %s", operation, error, exc_info=error)
         raise ServiceError(
             message=f"Service operation failed: {operation}",
             service_name=self.__class__.__name__,
@@ -85,10 +245,21 @@ class BaseService:
         Raises:
             DatabaseError: If database operation fails
         """
+        cache = _request_cache(self.db.session)
+        key = ('get_by_id', model_class, id)
+        if cache is not None:
+            instance = cache.get(key, _MISSING)
+            if instance is not _MISSING:
+                return instance
+        
         try:
-            return model_class.query.get(id)
+            instance = self.db.session.get(model_class, id)
         except SQLAlchemyError as e:
             self._handle_database_error(f"get_by_id for {model_class.__name__}", e)
+        
+        if cache is not None:
+            cache[key] = instance
+        return instance
     
     def get_by_id_or_404(self, model_class: Type[ModelType], id: Any) -> ModelType:
         """
@@ -105,8 +276,10 @@ class BaseService:
             ResourceNotFoundError: If model not found
             DatabaseError: If database operation fails
         """
+        # get_by_id, not an inlined session.get, so repeated lookups in one
+        # request are served from the per-request cache
         instance = self.get_by_id(model_class, id)
-        if not instance:
+        if instance is None:
             raise ResourceNotFoundError(
                 message=f"{model_class.__name__} not found",
                 resource_type=model_class.__name__,
@@ -114,12 +287,22 @@ class BaseService:
             )
         return instance
     
-    def get_all(self, model_class: Type[ModelType], **filters) -> List[ModelType]:
+    def get_all(
+        self, 
+        model_class: Type[ModelType], 
+        *, 
+        eager: Optional[Sequence[str]] = None, 
+        **filters
+    ) -> List[ModelType]:
         """
         Get all instances of a model with optional filters.
         
+        Relationships named in eager are loaded with one batched SELECT ... IN
+        per relationship, instead of one lazy load per instance on access.
+        
         Args:
             model_class: The model class to query
+            eager: Optional relationship names to load up front
             **filters: Optional filters to apply
         
         Returns:
@@ -127,12 +310,22 @@ class BaseService:
         
         Raises:
             DatabaseError: If database operation fails
+            ValidationError: If an eager name is not a relationship
         """
+        relationships = inspect(model_class).relationships
+        for name in eager or ():
+            if name not in relationships:
+                raise ValidationError(
+                    message=f"Invalid relationship: {name}",
+                    field='eager',
+                    value=name
+                )
+        
         try:
-            query = model_class.query
-            for key, value in filters.items():
-                if hasattr(model_class, key):
-                    query = query.filter(getattr(model_class, key) == value)
+            query = model_class.query.options(
+                *(selectinload(getattr(model_class, name)) for name in eager or ())
+            )
+            query = query.filter(*_filter_conditions(model_class, filters))
             return query.all()
         except SQLAlchemyError as e:
             self._handle_database_error(f"get_all for {model_class.__name__}", e)
@@ -152,15 +345,24 @@ class BaseService:
             DatabaseError: If database operation fails
             ValidationError: If validation fails
         """
+        # Every key must be a mapped attribute and every required field
+        # present; two set operations, checked before the ORM sees the data
+        unknown = data.keys() - _mapped_attrs(model_class)
+        if unknown:
+            field = sorted(unknown)[0]
+            raise ValidationError(
+                message=f"Invalid field: {field}",
+                field=field,
+                value=data[field]
+            )
+        self._validate_required_fields(model_class, data)
+        
         try:
-            # Validate required fields
-            self._validate_required_fields(model_class, data)
-            
             instance = model_class(**data)
             self.db.session.add(instance)
             self.db.session.commit()
             
-            self.logger.info(f"Created {model_class.__name__} with ID: {instance.id}")
+            self.logger.info("Created %s with ID: %s", model_class.__name__, instance.id)
             return instance
             
         except SQLAlchemyError as e:
@@ -186,8 +388,9 @@ class BaseService:
             ValidationError: If validation fails
         """
         try:
+            attrs = _mapped_attrs(instance.__class__)
             for key, value in data.items():
-                if hasattr(instance, key):
+                if key in attrs:
                     setattr(instance, key, value)
                 else:
                     raise ValidationError(
@@ -198,7 +401,7 @@ class BaseService:
             
             self.db.session.commit()
             
-            self.logger.info(f"Updated {instance.__class__.__name__} with ID: {instance.id}")
+            self.logger.info("Updated %s with ID: %s", instance.__class__.__name__, instance.id)
             return instance
             
         except SQLAlchemyError as e:
@@ -228,7 +431,7 @@ class BaseService:
             self.db.session.delete(instance)
             self.db.session.commit()
             
-            self.logger.info(f"Deleted {instance_class} with ID: {instance_id}")
+            self.logger.info("Deleted %s with ID: %s", instance_class, instance_id)
             return True
             
         except SQLAlchemyError as e:
@@ -250,8 +453,24 @@ class BaseService:
             ResourceNotFoundError: If model not found
             DatabaseError: If database operation fails
         """
-        instance = self.get_by_id_or_404(model_class, id)
-        return self.delete(instance)
+        try:
+            # Single DELETE by primary key; the row is never loaded. Objects
+            # already in the session are marked deleted by the ORM statement
+            result = self.db.session.execute(delete(model_class).where(model_class.id == id))
+            if result.rowcount == 0:
+                raise ResourceNotFoundError(
+                    message=f"{model_class.__name__} not found",
+                    resource_type=model_class.__name__,
+                    resource_id=str(id)
+                )
+            self.db.session.commit()
+            
+            self.logger.info("Deleted %s with ID: %s", model_class.__name__, id)
+            return True
+            
+        except SQLAlchemyError as e:
+            self.db.session.rollback()
+            self._handle_database_error(f"delete_by_id for {model_class.__name__}", e)
     
     def exists(self, model_class: Type[ModelType], **filters) -> bool:
         """
@@ -267,14 +486,25 @@ class BaseService:
         Raises:
             DatabaseError: If database operation fails
         """
+        cache = _request_cache(self.db.session)
+        cache_key = _filters_key('exists', model_class, filters) if cache is not None else None
+        if cache_key is not None:
+            result = cache.get(cache_key, _MISSING)
+            if result is not _MISSING:
+                return result
+        
         try:
-            query = model_class.query
-            for key, value in filters.items():
-                if hasattr(model_class, key):
-                    query = query.filter(getattr(model_class, key) == value)
-            return query.first() is not None
+            conditions = _filter_conditions(model_class, filters)
+            # SELECT EXISTS (SELECT 1 ...): the database stops at the first
+            # match and returns a single boolean instead of a full row
+            subquery = select(literal_column('1')).select_from(model_class).where(*conditions)
+            result = self.db.session.execute(select(exists(subquery))).scalar()
         except SQLAlchemyError as e:
             self._handle_database_error(f"exists check for {model_class.__name__}", e)
+        
+        if cache_key is not None:
+            cache[cache_key] = result
+        return result
     
     def count(self, model_class: Type[ModelType], **filters) -> int:
         """
@@ -290,29 +520,46 @@ class BaseService:
         Raises:
             DatabaseError: If database operation fails
         """
+        cache = _request_cache(self.db.session)
+        cache_key = _filters_key('count', model_class, filters) if cache is not None else None
+        if cache_key is not None:
+            result = cache.get(cache_key, _MISSING)
+            if result is not _MISSING:
+                return result
+        
         try:
-            query = model_class.query
-            for key, value in filters.items():
-                if hasattr(model_class, key):
-                    query = query.filter(getattr(model_class, key) == value)
-            return query.count()
+            query = model_class.query.filter(*_filter_conditions(model_class, filters))
+            result = query.count()
         except SQLAlchemyError as e:
             self._handle_database_error(f"count for {model_class.__name__}", e)
+        
+        if cache_key is not None:
+            cache[cache_key] = result
+        return result
     
     def paginate(
         self, 
         model_class: Type[ModelType], 
         page: int = 1, 
         per_page: int = 20, 
+        cursor: Optional[Any] = None, 
+        keyset: bool = False, 
         **filters
     ) -> Dict[str, Any]:
         """
         Get paginated results for a model.
         
+        With keyset=True, pages are addressed by the last id of the previous
+        page instead of a page number. Rows are ordered by id, one extra row is
+        fetched to detect a next page, and no COUNT query is issued, so the
+        result has no total or pages.
+        
         Args:
             model_class: The model class to query
-            page: Page number (1-based)
+            page: Page number (1-based), ignored in keyset mode
             per_page: Number of items per page
+            cursor: next_cursor of the previous page in keyset mode
+            keyset: Whether to use keyset pagination
             **filters: Optional filters to apply
         
         Returns:
@@ -322,10 +569,20 @@ class BaseService:
             DatabaseError: If database operation fails
         """
         try:
-            query = model_class.query
-            for key, value in filters.items():
-                if hasattr(model_class, key):
-                    query = query.filter(getattr(model_class, key) == value)
+            query = model_class.query.filter(*_filter_conditions(model_class, filters))
+            
+            if keyset:
+                if cursor is not None:
+                    query = query.filter(model_class.id > cursor)
+                rows = query.order_by(model_class.id).limit(per_page + 1).all()
+                items = rows[:per_page]
+                
+                return {
+                    'items': items,
+                    'per_page': per_page,
+                    'has_next': len(rows) > per_page,
+                    'next_cursor': items[-1].id if len(rows) > per_page else None
+                }
             
             pagination = query.paginate(
                 page=page, 
@@ -346,55 +603,101 @@ class BaseService:
         except SQLAlchemyError as e:
             self._handle_database_error(f"paginate for {model_class.__name__}", e)
     
-    def _validate_required_fields(self, model_class: Type[ModelType], data: Dict[str, Any]) -> None:
+    def _validate_required_fields(
+        self, 
+        model_class: Type[ModelType], 
+        data: Dict[str, Any], 
+        required: Optional[tuple] = None
+    ) -> None:
         """
         Validate that required fields are present in the data.
         
         Args:
             model_class: The model class to validate against
             data: The data to validate
+            required: Fields from _required_fields(model_class), if the caller
+                already has them
         
         Raises:
             ValidationError: If required fields are missing
         """
-        # This is a basic implementation - can be extended based on model requirements
-        # For now, we'll just check for common required fields
-        required_fields = ['name', 'title']  # Add more as needed
+        if required is None:
+            required = _required_fields(model_class)
         
-        for field in required_fields:
-            if hasattr(model_class, field) and field not in data:
+        for field in required:
+            if field not in data:
                 raise ValidationError(
                     message=f"Required field missing: {field}",
                     field=field
                 )
     
-    def bulk_create(self, model_class: Type[ModelType], data_list: List[Dict[str, Any]]) -> List[ModelType]:
+    def bulk_create(
+        self, 
+        model_class: Type[ModelType], 
+        data_list: List[Dict[str, Any]], 
+        batch_size: int = BULK_BATCH_SIZE,
+        return_instances: bool = True,
+        synchronous_commit: bool = True
+    ) -> Union[List[ModelType], int]:
         """
         Create multiple model instances in a single transaction.
         
+        Rows are sent batch_size at a time and committed once at the end, so
+        the load pays for a single durable commit. With return_instances=False
+        no objects are built and nothing enters the identity map, so memory
+        stays bounded by one batch of parameters.
+        
         Args:
             model_class: The model class to create
             data_list: List of data dictionaries for new instances
+            batch_size: Number of rows sent per INSERT batch
+            return_instances: Whether to return the created instances
+            synchronous_commit: On PostgreSQL, pass False to skip waiting for
+                the WAL flush at commit; a crash may then lose the load, but
+                never leaves it partially applied
         
         Returns:
-            List of created model instances
+            List of created model instances, or the number of rows inserted if
+            return_instances is False
         
         Raises:
             DatabaseError: If database operation fails
             ValidationError: If validation fails
         """
         try:
-            instances = []
+            required = _required_fields(model_class)
             for data in data_list:
-                self._validate_required_fields(model_class, data)
-                instance = model_class(**data)
-                instances.append(instance)
-                self.db.session.add(instance)
+                self._validate_required_fields(model_class, data, required)
             
-            self.db.session.commit()
+            session = self.db.session
+            dialect = session.get_bind().dialect
+            use_returning = dialect.insert_executemany_returning
+            instances = []
             
-            self.logger.info(f"Bulk created {len(instances)} {model_class.__name__} instances")
-            return instances
+            if not synchronous_commit and dialect.name == 'postgresql':
+                session.execute(text("SET LOCAL synchronous_commit = off"))
+            
+            # Nothing queried here needs pending objects flushed first
+            with session.no_autoflush:
+                for start in range(0, len(data_list), batch_size):
+                    chunk = data_list[start:start + batch_size]
+                    
+                    if not return_instances:
+                        session.execute(insert(model_class), chunk)
+                    elif use_returning:
+                        # ORM bulk INSERT: rows go out as multi-row VALUES statements
+                        # (insertmanyvalues) and come back as instances via RETURNING
+                        instances.extend(session.scalars(insert(model_class).returning(model_class), chunk))
+                    else:
+                        chunk_instances = [model_class(**data) for data in chunk]
+                        session.add_all(chunk_instances)
+                        session.flush()
+                        instances.extend(chunk_instances)
+            
+            session.commit()
+            
+            self.logger.info("Bulk created %d %s instances", len(data_list), model_class.__name__)
+            return instances if return_instances else len(data_list)
             
         except SQLAlchemyError as e:
             self.db.session.rollback()
@@ -403,6 +706,128 @@ class BaseService:
             self.db.session.rollback()
             self._handle_service_error(f"bulk_create for {model_class.__name__}", e)
     
+    def bulk_insert_core(
+        self, 
+        model_class: Type[ModelType], 
+        rows: List[Dict[str, Any]], 
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> int:
+        """
+        Insert many rows with Core executemany INSERTs on the model's table.
+        
+        Bypasses the ORM entirely: no instances, attribute events or identity
+        map entries. Keys must be column names; Python-side column defaults
+        are still applied. Use for imports where the caller does not need the
+        created objects.
+        
+        Args:
+            model_class: The model class whose table receives the rows
+            rows: List of column-value dictionaries
+            batch_size: Number of rows sent per INSERT batch
+        
+        Returns:
+            Number of rows inserted
+        
+        Raises:
+            DatabaseError: If database operation fails
+            ValidationError: If validation fails
+        """
+        try:
+            required = _required_fields(model_class)
+            for row in rows:
+                self._validate_required_fields(model_class, row, required)
+            
+            session = self.db.session
+            statement = model_class.__table__.insert()
+            with session.no_autoflush:
+                for start in range(0, len(rows), batch_size):
+                    session.execute(statement, rows[start:start + batch_size])
+            session.commit()
+            
+            self.logger.info("Bulk inserted %d %s rows", len(rows), model_class.__name__)
+            return len(rows)
+            
+        except SQLAlchemyError as e:
+            self.db.session.rollback()
+            self._handle_database_error(f"bulk_insert_core for {model_class.__name__}", e)
+        except Exception as e:
+            self.db.session.rollback()
+            self._handle_service_error(f"bulk_insert_core for {model_class.__name__}", e)
+    
+    def upsert(
+        self, 
+        model_class: Type[ModelType], 
+        rows: List[Dict[str, Any]], 
+        conflict_cols: Sequence[str], 
+        update_cols: Optional[Sequence[str]] = None
+    ) -> int:
+        """
+        Insert rows, updating the existing row wherever a conflict occurs.
+        
+        Emits one dialect-native statement (ON CONFLICT DO UPDATE on
+        PostgreSQL and SQLite, ON DUPLICATE KEY UPDATE on MySQL), executed for
+        all rows at once, instead of a lookup followed by an insert or update.
+        
+        Args:
+            model_class: The model class whose table receives the rows
+            rows: List of column-value dictionaries
+            conflict_cols: Columns of the unique constraint that detects
+                existing rows (ignored by MySQL, which uses any unique key)
+            update_cols: Columns overwritten on conflict; defaults to every
+                column in the rows except conflict_cols
+        
+        Returns:
+            Number of rows sent
+        
+        Raises:
+            DatabaseError: If database operation fails
+            ServiceError: If the database has no native upsert
+            ValidationError: If a column name is not part of the table
+        """
+        if not rows:
+            return 0
+        
+        table = model_class.__table__
+        if update_cols is None:
+            update_cols = [col for col in rows[0] if col not in conflict_cols]
+        for col in [*conflict_cols, *update_cols]:
+            if col not in table.c:
+                raise ValidationError(
+                    message=f"Invalid column: {col}",
+                    field=col
+                )
+        
+        try:
+            session = self.db.session
+            dialect_name = session.get_bind().dialect.name
+            if dialect_name in ('postgresql', 'sqlite'):
+                dialect_insert = postgresql_insert if dialect_name == 'postgresql' else sqlite_insert
+                statement = dialect_insert(table)
+                statement = statement.on_conflict_do_update(
+                    index_elements=list(conflict_cols),
+                    set_={col: statement.excluded[col] for col in update_cols}
+                )
+            elif dialect_name in ('mysql', 'mariadb'):
+                statement = mysql_insert(table)
+                statement = statement.on_duplicate_key_update(
+                    {col: statement.inserted[col] for col in update_cols}
+                )
+            else:
+                raise ServiceError(
+                    message=f"Upsert is not supported on {dialect_name}",
+                    service_name=self.__class__.__name__
+                )
+            
+            session.execute(statement, rows)
+            session.commit()
+            
+            self.logger.info("Upserted %d %s rows", len(rows), model_class.__name__)
+            return len(rows)
+            
+        except SQLAlchemyError as e:
+            self.db.session.rollback()
+            self._handle_database_error(f"upsert for {model_class.__name__}", e)
+    
     def bulk_update(self, instances: List[ModelType], data_list: List[Dict[str, Any]]) -> List[ModelType]:
         """
         Update multiple model instances in a single transaction.
@@ -425,20 +850,32 @@ class BaseService:
             )
         
         try:
+            # Group primary-key-keyed parameter sets per model class
+            mappings_by_class = {}
             for instance, data in zip(instances, data_list):
+                mapper = inspect(instance.__class__)
                 for key, value in data.items():
-                    if hasattr(instance, key):
-                        setattr(instance, key, value)
-                    else:
+                    if key not in mapper.column_attrs:
                         raise ValidationError(
                             message=f"Invalid field: {key}",
                             field=key,
                             value=value
                         )
+                
+                params = {prop.key: getattr(instance, prop.key)
+                          for prop in map(mapper.get_property_by_column, mapper.primary_key)}
+                params.update(data)
+                mappings_by_class.setdefault(instance.__class__, []).append(params)
+            
+            # ORM bulk UPDATE by primary key: one executemany per class. Values
+            # are not copied onto the instances; they are expired by the commit
+            # and reload the new values on next access
+            for model_class, mappings in mappings_by_class.items():
+                self.db.session.execute(update(model_class), mappings)
             
             self.db.session.commit()
             
-            self.logger.info(f"Bulk updated {len(instances)} instances")
+            self.logger.info("Bulk updated %d instances", len(instances))
             return instances
             
         except SQLAlchemyError as e:
@@ -448,7 +885,7 @@ class BaseService:
             self.db.session.rollback()
             self._handle_service_error("bulk_update", e)
     
-    def execute_raw_query(self, query: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    def execute_raw_query(self, query: str, params: Dict[str, Any] = None) -> List[Mapping[str, Any]]:
         """
         Execute a raw SQL query.
         
@@ -457,14 +894,46 @@ class BaseService:
             params: Optional query parameters
         
         Returns:
-            List of result dictionaries
+            List of result rows as read-only mappings
         
         Raises:
             DatabaseError: If database operation fails
         """
         try:
-            result = self.db.session.execute(query, params or {})
-            return [dict(row) for row in result]
+            result = self.db.session.execute(text(query), params or {})
+            return result.mappings().all()
+        except SQLAlchemyError as e:
+            self._handle_database_error("raw query execution", e)
+    
+    def iter_raw_query(
+        self, 
+        query: str, 
+        params: Dict[str, Any] = None, 
+        yield_per: int = RAW_QUERY_BATCH_SIZE
+    ) -> Iterator[Mapping[str, Any]]:
+        """
+        Execute a raw SQL query and stream its rows.
+        
+        Rows are fetched from the cursor yield_per at a time, so memory stays
+        bounded for large result sets. Errors raised while iterating are not
+        wrapped in DatabaseError.
+        
+        Args:
+            query: SQL query string
+            params: Optional query parameters
+            yield_per: Number of rows fetched per batch
+        
+        Returns:
+            Iterator over result rows as mappings
+        
+        Raises:
+            DatabaseError: If the query cannot be executed
+        """
+        try:
+            result = self.db.session.execute(
+                text(query), params or {}, execution_options={'yield_per': yield_per}
+            )
+            return iter(result.mappings())
         except SQLAlchemyError as e:
             self._handle_database_error("raw query execution", e)
     
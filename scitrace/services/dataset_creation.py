@@ -5,106 +5,24 @@ Handles DataLad dataset creation and initialization.
 """
 
 import os
-import json
-import random
-from datetime import datetime, timezone
-from pathlib import Path
+import errno
+import shutil
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta, timezone
 
 from ..utils.datalad_utils import DataLadUtils, DataLadCommandError
 from ..exceptions import DatasetError, ValidationError
 from .base_service import BaseService
 
 
-class DatasetCreationService(BaseService):
-    """Service for DataLad dataset creation operations."""
-    
-    def __init__(self, db=None):
-        super().__init__(db)
-        self.datalad_utils = DataLadUtils()
-        home_dir = os.path.expanduser("~")
-        self.base_path = os.environ.get('DATALAD_BASE_PATH', os.path.join(home_dir, 'scitrace_demo_datasets'))
-        os.makedirs(self.base_path, exist_ok=True)
-    
-    def create_dataset(self, dataset_path: str, name: str = None, research_type: str = "general") -> dict:
-        """
-        Create a new DataLad dataset at the specified path.
-        
-        Args:
-            dataset_path: Path where to create the dataset
-            name: Optional name for the dataset
-            research_type: Type of research (affects dataset structure)
-        
-        Returns:
-            Dict containing creation result information
-        
-        Raises:
-            DatasetError: If dataset creation fails
-            ValidationError: If parameters are invalid
-        """
-        if not dataset_path:
-            raise ValidationError("Dataset path is required")
-        
-        if os.path.exists(dataset_path):
-            raise DatasetError(f"Dataset already exists at {dataset_path}", dataset_path=dataset_path)
-        
-        try:
-            # Create DataLad dataset using the utility
-            result = self.datalad_utils.create_dataset(dataset_path, research_type, name)
-            
-            # Create empty directory structure
-            self._create_empty_structure(dataset_path, research_type, name or os.path.basename(dataset_path))
-            
-            return result
-            
-        except DataLadCommandError as e:
-            raise DatasetError(f"Failed to create DataLad dataset: {e.message}", dataset_path=dataset_path)
-        except Exception as e:
-            raise DatasetError(f"Unexpected error creating dataset: {str(e)}", dataset_path=dataset_path)
-    
-    def _create_empty_structure(self, dataset_path: str, research_type: str, project_name: str):
-        """Create empty directory structure without sample files."""
-        print(f"Creating empty directory structure for {research_type} research...")
-        
-        # Create research-specific directories (empty)
-        research_dirs = {
-            "environmental": ["raw_data", "scripts", "results", "plots"],
-            "biomedical": ["raw_data", "scripts", "results", "plots"],
-            "computational": ["raw_data", "scripts", "results", "plots"],
-            "general": ["raw_data", "scripts", "results", "plots"]
-        }
-        
-        dirs = research_dirs.get(research_type, research_dirs["general"])
-        
-        for dir_name in dirs:
-            dir_path = os.path.join(dataset_path, dir_name)
-            os.makedirs(dir_path, exist_ok=True)
-            print(f"     ✅ Created empty directory: {dir_name}")
-        
-        # Create basic README
-        self._create_basic_readme(dataset_path, project_name, research_type)
-        
-        # Create .gitignore file
-        self._create_gitignore(dataset_path)
-        
-        # Add empty directories to DataLad
-        try:
-            self.datalad_utils.save_changes(
-                dataset_path, 
-                f'Create empty structure for {project_name} ({research_type})'
-            )
-            print(f"     🔄 Saved empty structure to DataLad: {os.path.basename(dataset_path)}")
-        except DataLadCommandError as e:
-            print(f"     ⚠️ Warning: Could not save to DataLad: {e.message}")
-    
-    def _create_basic_readme(self, dataset_path: str, project_name: str, research_type: str):
-        """Create a basic README file without sample content."""
-        readme_content = f"""# {project_name}
+# README.md written by _create_basic_readme
+_README_TEMPLATE = """# {project_name}
 
 ## Project Overview
 This dataset contains research data and analysis for the {project_name} project.
 
 ## Research Type
-{research_type.title()} Research
+{research_title} Research
 
 ## Directory Structure
 - `raw_data/` - Original data files
@@ -128,9 +46,9 @@ datalad status
 ```
 
 ## Project Information
-- Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+- Created: {created}
 - Dataset Path: {dataset_path}
-- Research Type: {research_type.title()}
+- Research Type: {research_title}
 - Managed by: SciTrace
 
 ## Getting Started
@@ -139,18 +57,9 @@ datalad status
 3. Save your work with DataLad commands
 4. Use SciTrace to visualize your dataflow
 """
-        
-        readme_path = os.path.join(dataset_path, 'README.md')
-        # Only create README if it doesn't exist as a symlink (Git annex managed)
-        if not os.path.islink(readme_path):
-            with open(readme_path, 'w') as f:
-                f.write(readme_content)
-        else:
-            print(f"     ⚠️ Skipping README.md creation (already exists as symlink)")
-    
-    def _create_gitignore(self, dataset_path: str):
-        """Create a .gitignore file with common patterns."""
-        gitignore_content = """# macOS system files
+
+# .gitignore written by _create_gitignore, kept as bytes since it is written verbatim
+_GITIGNORE = b"""# macOS system files
 .DS_Store
 .DS_Store?
 ._*
@@ -215,116 +124,11 @@ venv.bak/
 # *.h5
 # *.hdf5
 """
-        
-        gitignore_path = os.path.join(dataset_path, '.gitignore')
-        with open(gitignore_path, 'w') as f:
-            f.write(gitignore_content)
-        print(f"     ✅ Created .gitignore file")
-    
-    def create_dataset_with_content(self, dataset_path: str, name: str, research_type: str = "general") -> dict:
-        """
-        Create a DataLad dataset with sample content.
-        
-        Args:
-            dataset_path: Path where to create the dataset
-            name: Name for the dataset
-            research_type: Type of research
-        
-        Returns:
-            Dict containing creation result information
-        """
-        # First create the basic dataset
-        result = self.create_dataset(dataset_path, name, research_type)
-        
-        # Add research-specific content
-        self._add_research_content(dataset_path, research_type, name)
-        
-        return result
-    
-    def _add_research_content(self, dataset_path: str, research_type: str, project_name: str):
-        """Add research-specific content to the dataset."""
-        print(f"Adding {research_type} research content to {os.path.basename(dataset_path)}...")
-        
-        # Create research-specific directories and files
-        research_structure = {
-            "environmental": {
-                "raw_data": ["water_samples", "air_quality", "soil_samples"],
-                "scripts": ["data_cleaning.py", "statistical_analysis.R", "visualization.py"],
-                "results": ["water_quality_report.pdf", "statistical_summary.csv", "correlation_analysis.json"],
-                "plots": ["water_quality_trends.png", "correlation_heatmap.png", "geographic_distribution.png"]
-            },
-            "biomedical": {
-                "raw_data": ["patient_records", "lab_results", "imaging_data"],
-                "scripts": ["data_preprocessing.py", "statistical_tests.R", "machine_learning.py"],
-                "results": ["clinical_analysis_report.pdf", "statistical_results.csv", "ml_model_performance.json"],
-                "plots": ["patient_demographics.png", "treatment_outcomes.png", "feature_importance.png"]
-            },
-            "computational": {
-                "raw_data": ["training_data", "validation_data", "test_data"],
-                "scripts": ["model_training.py", "hyperparameter_tuning.py", "evaluation.py"],
-                "results": ["model_performance.pdf", "training_metrics.csv", "hyperparameter_results.json"],
-                "plots": ["training_curves.png", "confusion_matrix.png", "feature_importance.png"]
-            },
-            "general": {
-                "raw_data": ["input_data", "reference_data"],
-                "scripts": ["main_analysis.py", "data_processing.py", "visualization.py"],
-                "results": ["analysis_report.pdf", "results_summary.csv", "output_data.json"],
-                "plots": ["main_results.png", "data_overview.png", "analysis_charts.png"]
-            }
-        }
-        
-        if research_type not in research_structure:
-            research_type = "general"
-        
-        dirs = research_structure[research_type]
-        
-        for dir_name, files in dirs.items():
-            dir_path = os.path.join(dataset_path, dir_name)
-            os.makedirs(dir_path, exist_ok=True)
-            
-            # Create sample files
-            for filename in files:
-                file_path = os.path.join(dir_path, filename)
-                
-                if filename.endswith('.py'):
-                    content = self._create_python_script(filename, research_type, project_name)
-                elif filename.endswith('.R'):
-                    content = self._create_r_script(filename, research_type, project_name)
-                elif filename.endswith('.csv'):
-                    content = self._create_csv_data(filename, research_type)
-                elif filename.endswith('.json'):
-                    content = json.dumps(self._create_json_data(filename, research_type), indent=2)
-                elif filename.endswith('.md'):
-                    content = self._create_markdown_file(filename, research_type, project_name)
-                else:
-                    # For other files, create placeholder content
-                    content = f"# {filename}\n\nThis is a sample {filename} file for {research_type} research.\n\nGenerated by SciTrace for project: {project_name}\n\nCreated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                
-                with open(file_path, 'w') as f:
-                    f.write(content)
-                
-                # Make Python scripts executable
-                if filename.endswith('.py'):
-                    os.chmod(file_path, 0o755)
-                
-                print(f"     ✅ Created: {dir_name}/{filename}")
-        
-        # Add all files to DataLad
-        try:
-            self.datalad_utils.save_changes(
-                dataset_path, 
-                f'Add research content for {project_name} ({research_type})'
-            )
-            print(f"     🔄 Saved to DataLad: {os.path.basename(dataset_path)}")
-        except DataLadCommandError as e:
-            print(f"     ⚠️ Warning: Could not save to DataLad: {e.message}")
-    
-    def _create_python_script(self, filename: str, research_type: str, project_name: str) -> str:
-        """Create a realistic Python script based on research type."""
-        if "cleaning" in filename.lower():
-            return f'''#!/usr/bin/env python3
+
+# Sample Python scripts; literal braces in the scripts are doubled for str.format
+_PY_CLEANING_TEMPLATE = '''#!/usr/bin/env python3
 """
-Data Cleaning Script for {research_type.title()} Research
+Data Cleaning Script for {research_title} Research
 Project: {project_name}
 Generated by SciTrace
 """
@@ -388,10 +192,10 @@ if __name__ == "__main__":
         print("❌ Data cleaning failed")
         sys.exit(1)
 '''
-        elif "analysis" in filename.lower():
-            return f'''#!/usr/bin/env python3
+
+_PY_ANALYSIS_TEMPLATE = '''#!/usr/bin/env python3
 """
-Data Analysis Script for {research_type.title()} Research
+Data Analysis Script for {research_title} Research
 Project: {project_name}
 Generated by SciTrace
 """
@@ -426,12 +230,12 @@ def analyze_data(data_file):
 if __name__ == "__main__":
     analyze_data("preprocessed/cleaned_data.csv")
 '''
-        else:
-            return f'''#!/usr/bin/env python3
+
+_PY_SCRIPT_TEMPLATE = '''#!/usr/bin/env python3
 """
-{filename.replace('.py', '').replace('_', ' ').title()} Script
+{title} Script
 Project: {project_name}
-Research Type: {research_type.title()}
+Research Type: {research_title}
 Generated by SciTrace
 """
 
@@ -447,11 +251,17 @@ def main():
 if __name__ == "__main__":
     main()
 '''
-    
-    def _create_r_script(self, filename: str, research_type: str, project_name: str) -> str:
-        """Create a realistic R script based on research type."""
-        return f'''# {filename}
-# {research_type.title()} Research Script
+
+# Python script templates chosen by a keyword in the file name; others get
+# _PY_SCRIPT_TEMPLATE
+_PY_TEMPLATES = (
+    ('cleaning', _PY_CLEANING_TEMPLATE),
+    ('analysis', _PY_ANALYSIS_TEMPLATE),
+)
+
+# Sample R script
+_R_SCRIPT_TEMPLATE = '''# {filename}
+# {research_title} Research Script
 # Project: {project_name}
 # Generated by SciTrace
 
@@ -469,69 +279,469 @@ print("R script loaded successfully!")
 # data <- data.frame(x = 1:10, y = rnorm(10))
 # ggplot(data, aes(x, y)) + geom_point() + ggtitle("{project_name}")
 '''
+
+# Sample markdown document
+_MARKDOWN_TEMPLATE = """# {title}
+
+## Project: {project_name}
+**Research Type:** {research_title}
+
+## Overview
+This document contains analysis results and findings for the {project_name} project.
+
+## Key Findings
+- Sample analysis completed successfully
+- Data quality assessment performed
+- Statistical tests conducted
+
+## Next Steps
+1. Review results
+2. Validate findings
+3. Prepare final report
+
+---
+*Generated by SciTrace on {created}*
+"""
+
+# Directories created for every dataset, whatever the research type
+_EMPTY_DIRS = ("raw_data", "scripts", "results", "plots")
+
+# Sample files added by create_dataset_with_content, by research type and directory
+_RESEARCH_STRUCTURE = {
+    "environmental": {
+        "raw_data": ("water_samples", "air_quality", "soil_samples"),
+        "scripts": ("data_cleaning.py", "statistical_analysis.R", "visualization.py"),
+        "results": ("water_quality_report.pdf", "statistical_summary.csv", "correlation_analysis.json"),
+        "plots": ("water_quality_trends.png", "correlation_heatmap.png", "geographic_distribution.png")
+    },
+    "biomedical": {
+        "raw_data": ("patient_records", "lab_results", "imaging_data"),
+        "scripts": ("data_preprocessing.py", "statistical_tests.R", "machine_learning.py"),
+        "results": ("clinical_analysis_report.pdf", "statistical_results.csv", "ml_model_performance.json"),
+        "plots": ("patient_demographics.png", "treatment_outcomes.png", "feature_importance.png")
+    },
+    "computational": {
+        "raw_data": ("training_data", "validation_data", "test_data"),
+        "scripts": ("model_training.py", "hyperparameter_tuning.py", "evaluation.py"),
+        "results": ("model_performance.pdf", "training_metrics.csv", "hyperparameter_results.json"),
+        "plots": ("training_curves.png", "confusion_matrix.png", "feature_importance.png")
+    },
+    "general": {
+        "raw_data": ("input_data", "reference_data"),
+        "scripts": ("main_analysis.py", "data_processing.py", "visualization.py"),
+        "results": ("analysis_report.pdf", "results_summary.csv", "output_data.json"),
+        "plots": ("main_results.png", "data_overview.png", "analysis_charts.png")
+    }
+}
+
+# Format of the creation timestamps written into generated files
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Placeholder content for sample files of other types
+_PLACEHOLDER_TEMPLATE = "# {filename}\n\nThis is a sample {filename} file for {research_type} research.\n\nGenerated by SciTrace for project: {project_name}\n\nCreated: {created}"
+
+# Threads writing sample files, shared by all dataset creations
+FILE_WRITE_WORKERS = 4
+_FILE_WRITE_EXECUTOR = ThreadPoolExecutor(max_workers=FILE_WRITE_WORKERS)
+
+
+def _ensure_dirs(parent: str, names, fresh: bool = False) -> dict:
+    """
+    Create the named subdirectories of parent that do not exist yet.
+    
+    Lists parent once instead of stat-ing every path, and only calls mkdir
+    for the missing names.
+    
+    Args:
+        parent: Existing directory to create the subdirectories in
+        names: Subdirectory names
+        fresh: parent was just created, so it is not listed and every name
+            goes straight to mkdir
+    
+    Returns:
+        Dict of name to os.DirEntry for the entries parent held beforehand
+        (empty if fresh)
+    """
+    existing = {}
+    if not fresh:
+        with os.scandir(parent) as entries:
+            existing = {entry.name: entry for entry in entries}
+    
+    for name in names:
+        if name not in existing:
+            try:
+                os.mkdir(os.path.join(parent, name))
+            except FileExistsError:
+                pass
+    return existing
+
+
+def _write_all(fd: int, data: bytes):
+    """
+    Write data to an open file descriptor, retrying on short writes.
+    
+    Args:
+        fd: Open file descriptor
+        data: Bytes to write
+    """
+    data = memoryview(data)
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _write_file(dir_fd: int, filename: str, content: str):
+    """
+    Create or overwrite a file inside an open directory.
+    
+    Python scripts are made executable.
+    
+    Args:
+        dir_fd: Open descriptor of the directory
+        filename: Name of the file within the directory
+        content: Text to write
+    """
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666, dir_fd=dir_fd)
+    try:
+        _write_all(fd, content.encode('utf-8'))
+        
+        # Make Python scripts executable
+        if filename.endswith('.py'):
+            os.fchmod(fd, 0o755)
+    finally:
+        os.close(fd)
+
+
+class DatasetCreationService(BaseService):
+    """Service for DataLad dataset creation operations."""
+    
+    def __init__(self, db=None):
+        super().__init__(db)
+        self.datalad_utils = DataLadUtils()
+        home_dir = os.path.expanduser("~")
+        self.base_path = os.environ.get('DATALAD_BASE_PATH', os.path.join(home_dir, 'scitrace_demo_datasets'))
+        os.makedirs(self.base_path, exist_ok=True)
+    
+    def create_dataset(self, dataset_path: str, name: str = None, research_type: str = "general",
+                       defer_save: bool = False) -> dict:
+        """
+        Create a new DataLad dataset at the specified path.
+        
+        Args:
+            dataset_path: Path where to create the dataset
+            name: Optional name for the dataset
+            research_type: Type of research (affects dataset structure)
+            defer_save: Leave the directory structure unsaved, for callers
+                that add more files and save once themselves
+        
+        Returns:
+            Dict containing creation result information
+        
+        Raises:
+            DatasetError: If dataset creation fails
+            ValidationError: If parameters are invalid
+        """
+        if not dataset_path:
+            raise ValidationError("Dataset path is required")
+        
+        # Creating the directory is the existence check, without a window
+        # between checking and creating
+        try:
+            os.makedirs(dataset_path)
+        except FileExistsError:
+            raise DatasetError(f"Dataset already exists at {dataset_path}", dataset_path=dataset_path)
+        
+        dataset_name = os.path.basename(dataset_path)
+        try:
+            # Create DataLad dataset using the utility
+            try:
+                result = self.datalad_utils.create_dataset(dataset_path, research_type, name, path_reserved=True)
+            except Exception:
+                # Release the path so the creation can be retried
+                shutil.rmtree(dataset_path, ignore_errors=True)
+                raise
+            
+            # Create empty directory structure
+            # The dataset directory was created above and only holds what
+            # datalad create put there
+            self._create_empty_structure(dataset_path, research_type, name or dataset_name,
+                                         save=not defer_save, fresh=True, dataset_name=dataset_name)
+            
+            return result
+            
+        except DataLadCommandError as e:
+            raise DatasetError(f"Failed to create DataLad dataset: {e.message}", dataset_path=dataset_path)
+        except Exception as e:
+            raise DatasetError(f"Unexpected error creating dataset: {str(e)}", dataset_path=dataset_path)
+    
+    def _create_empty_structure(self, dataset_path: str, research_type: str, project_name: str,
+                                save: bool = True, fresh: bool = False, dataset_name: str = None):
+        """Create empty directory structure without sample files."""
+        print(f"Creating empty directory structure for {research_type} research...")
+        
+        # Create the empty top-level directories
+        existing = _ensure_dirs(dataset_path, _EMPTY_DIRS, fresh=fresh)
+        for dir_name in _EMPTY_DIRS:
+            print(f"     ✅ Created empty directory: {dir_name}")
+        
+        # Create basic README
+        readme_entry = existing.get('README.md')
+        self._create_basic_readme(dataset_path, project_name, research_type,
+                                  is_symlink=readme_entry is not None and readme_entry.is_symlink())
+        
+        # Create .gitignore file
+        self._create_gitignore(dataset_path)
+        
+        if not save:
+            return
+        
+        # Add empty directories to DataLad
+        try:
+            self.datalad_utils.save_changes(
+                dataset_path, 
+                f'Create empty structure for {project_name} ({research_type})'
+            )
+            print(f"     🔄 Saved empty structure to DataLad: {dataset_name or os.path.basename(dataset_path)}")
+        except DataLadCommandError as e:
+            print(f"     ⚠️ Warning: Could not save to DataLad: {e.message}")
+    
+    def _create_basic_readme(self, dataset_path: str, project_name: str, research_type: str,
+                             is_symlink: bool = None, created: str = None):
+        """
+        Create a basic README file without sample content.
+        
+        Args:
+            dataset_path: Path of the dataset
+            project_name: Name of the project
+            research_type: Type of research
+            is_symlink: Whether README.md is already a symlink, if the caller
+                has listed the dataset directory; otherwise the open refuses
+                to follow one
+            created: Creation timestamp to record; defaults to now
+        """
+        readme_content = _README_TEMPLATE.format(
+            project_name=project_name,
+            research_type=research_type,
+            research_title=research_type.title(),
+            dataset_path=dataset_path,
+            created=created or datetime.now().strftime(TIMESTAMP_FORMAT)
+        )
+        
+        readme_path = os.path.join(dataset_path, 'README.md')
+        # Only create README if it doesn't exist as a symlink (Git annex managed).
+        # O_NOFOLLOW makes the open itself the check, so no separate lstat
+        fd = None
+        if not is_symlink:
+            try:
+                fd = os.open(readme_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o666)
+            except OSError as e:
+                if e.errno != errno.ELOOP:
+                    raise
+        
+        if fd is None:
+            print(f"     ⚠️ Skipping README.md creation (already exists as symlink)")
+            return
+        try:
+            _write_all(fd, readme_content.encode('utf-8'))
+        finally:
+            os.close(fd)
+    
+    def _create_gitignore(self, dataset_path: str):
+        """Create a .gitignore file with common patterns."""
+        fd = os.open(os.path.join(dataset_path, '.gitignore'), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            _write_all(fd, _GITIGNORE)
+        finally:
+            os.close(fd)
+        print(f"     ✅ Created .gitignore file")
+    
+    def create_dataset_with_content(self, dataset_path: str, name: str, research_type: str = "general") -> dict:
+        """
+        Create a DataLad dataset with sample content.
+        
+        Args:
+            dataset_path: Path where to create the dataset
+            name: Name for the dataset
+            research_type: Type of research
+        
+        Returns:
+            Dict containing creation result information
+        """
+        # First create the basic dataset; its structure is saved together
+        # with the content, so the dataset gets a single datalad save
+        result = self.create_dataset(dataset_path, name, research_type, defer_save=True)
+        
+        # Add research-specific content
+        self._add_research_content(dataset_path, research_type, name,
+                                   save_message=f'Create {name} with {research_type} content',
+                                   dataset_name=os.path.basename(dataset_path))
+        
+        return result
+    
+    def _add_research_content(self, dataset_path: str, research_type: str, project_name: str,
+                              created: str = None, save_message: str = None, dataset_name: str = None):
+        """Add research-specific content to the dataset."""
+        # One timestamp for every generated file of the dataset
+        created = created or datetime.now().strftime(TIMESTAMP_FORMAT)
+        dataset_name = dataset_name or os.path.basename(dataset_path)
+        print(f"Adding {research_type} research content to {dataset_name}...")
+        
+        # Create research-specific directories and files
+        if research_type not in _RESEARCH_STRUCTURE:
+            research_type = "general"
+        
+        dirs = _RESEARCH_STRUCTURE[research_type]
+        _ensure_dirs(dataset_path, dirs)
+        
+        # Contents are rendered here, in order; only the writes run on the pool
+        writes = [(dir_name, filename, self._render_sample_file(filename, research_type, project_name, created))
+                  for dir_name, files in dirs.items() for filename in files]
+        
+        # Directories are opened relative to the dataset and files relative to
+        # their directory, so the dataset path is resolved only once
+        dir_fds = {}
+        futures = []
+        try:
+            root_fd = os.open(dataset_path, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                for dir_name in dirs:
+                    dir_fds[dir_name] = os.open(dir_name, os.O_RDONLY | os.O_DIRECTORY, dir_fd=root_fd)
+            finally:
+                os.close(root_fd)
+            
+            futures = [_FILE_WRITE_EXECUTOR.submit(_write_file, dir_fds[dir_name], filename, content)
+                       for dir_name, filename, content in writes]
+            for future in futures:
+                future.result()
+        finally:
+            # The descriptors must outlive every write that may still use them
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            for dir_fd in dir_fds.values():
+                os.close(dir_fd)
+        created_files = ', '.join(f"{dir_name}/{filename}" for dir_name, filename, _ in writes)
+        print(f"     ✅ Created: {created_files}")
+        
+        # Add all files to DataLad
+        try:
+            self.datalad_utils.save_changes(
+                dataset_path, 
+                save_message or f'Add research content for {project_name} ({research_type})'
+            )
+            print(f"     🔄 Saved to DataLad: {dataset_name}")
+        except DataLadCommandError as e:
+            print(f"     ⚠️ Warning: Could not save to DataLad: {e.message}")
+    
+    def _render_sample_file(self, filename: str, research_type: str, project_name: str,
+                            created: str) -> str:
+        """
+        Build the content of a sample file from its extension.
+        
+        Args:
+            filename: Name of the sample file
+            research_type: Type of research
+            project_name: Name of the project
+            created: Creation timestamp to record in the file
+        
+        Returns:
+            File content
+        """
+        if filename.endswith('.py'):
+            return self._create_python_script(filename, research_type, project_name)
+        elif filename.endswith('.R'):
+            return self._create_r_script(filename, research_type, project_name)
+        elif filename.endswith('.csv'):
+            return self._create_csv_data(filename, research_type)
+        elif filename.endswith('.json'):
+            import json
+            return json.dumps(self._create_json_data(filename, research_type), indent=2)
+        elif filename.endswith('.md'):
+            return self._create_markdown_file(filename, research_type, project_name, created)
+        else:
+            # For other files, create placeholder content
+            return _PLACEHOLDER_TEMPLATE.format(
+                filename=filename,
+                research_type=research_type,
+                project_name=project_name,
+                created=created
+            )
+    
+    def _create_python_script(self, filename: str, research_type: str, project_name: str) -> str:
+        """Create a realistic Python script based on research type."""
+        name = filename.lower()
+        template = next((template for keyword, template in _PY_TEMPLATES if keyword in name),
+                        _PY_SCRIPT_TEMPLATE)
+        return template.format(
+            filename=filename,
+            title=filename.replace('.py', '').replace('_', ' ').title(),
+            project_name=project_name,
+            research_type=research_type,
+            research_title=research_type.title()
+        )
+    
+    def _create_r_script(self, filename: str, research_type: str, project_name: str) -> str:
+        """Create a realistic R script based on research type."""
+        return _R_SCRIPT_TEMPLATE.format(
+            filename=filename,
+            project_name=project_name,
+            research_type=research_type,
+            research_title=research_type.title()
+        )
     
     def _create_csv_data(self, filename: str, research_type: str) -> str:
         """Create sample CSV data based on research type."""
-        import pandas as pd
-        import numpy as np
+        import csv
+        import io
+        import random
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
         
         if "summary" in filename.lower():
-            data = {
-                'metric': ['mean', 'std', 'min', 'max', 'count'],
-                'value': [np.random.normal(100, 20), np.random.normal(15, 5), 
-                         np.random.uniform(50, 150), np.random.uniform(150, 250), 
-                         np.random.randint(100, 1000)]
-            }
+            writer.writerow(['metric', 'value'])
+            writer.writerows(zip(
+                ['mean', 'std', 'min', 'max', 'count'],
+                [random.gauss(100, 20), random.gauss(15, 5), 
+                 random.uniform(50, 150), random.uniform(150, 250), 
+                 float(random.randint(100, 999))]
+            ))
         else:
             # Create sample data
-            n_samples = np.random.randint(50, 200)
-            data = {
-                'id': range(1, n_samples + 1),
-                'value': np.random.normal(100, 20, n_samples),
-                'category': np.random.choice(['A', 'B', 'C'], n_samples),
-                'timestamp': pd.date_range(start='2024-01-01', periods=n_samples, freq='D')
-            }
+            n_samples = random.randint(50, 199)
+            start = date(2024, 1, 1)
+            writer.writerow(['id', 'value', 'category', 'timestamp'])
+            writer.writerows(
+                (i, random.gauss(100, 20), random.choice('ABC'), (start + timedelta(days=i - 1)).isoformat())
+                for i in range(1, n_samples + 1)
+            )
         
-        return pd.DataFrame(data).to_csv(index=False)
+        return buffer.getvalue()
     
     def _create_json_data(self, filename: str, research_type: str) -> dict:
         """Create sample JSON data based on research type."""
-        import numpy as np
+        import random
+        
         return {
             "project": f"{research_type}_research",
             "analysis_date": datetime.now().isoformat(),
             "parameters": {
-                "sample_size": np.random.randint(100, 1000),
+                "sample_size": random.randint(100, 999),
                 "confidence_level": 0.95,
                 "method": "standard_analysis"
             },
             "results": {
-                "mean": np.random.normal(100, 20),
-                "std": np.random.normal(15, 5),
-                "p_value": np.random.uniform(0, 1)
+                "mean": random.gauss(100, 20),
+                "std": random.gauss(15, 5),
+                "p_value": random.uniform(0, 1)
             }
         }
     
-    def _create_markdown_file(self, filename: str, research_type: str, project_name: str) -> str:
+    def _create_markdown_file(self, filename: str, research_type: str, project_name: str,
+                              created: str = None) -> str:
         """Create a markdown file based on research type."""
-        return f"""# {filename.replace('.md', '').replace('_', ' ').title()}
-
-## Project: {project_name}
-**Research Type:** {research_type.title()}
-
-## Overview
-This document contains analysis results and findings for the {project_name} project.
-
-## Key Findings
-- Sample analysis completed successfully
-- Data quality assessment performed
-- Statistical tests conducted
-
-## Next Steps
-1. Review results
-2. Validate findings
-3. Prepare final report
-
----
-*Generated by SciTrace on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
-"""
+        return _MARKDOWN_TEMPLATE.format(
+            title=filename.replace('.md', '').replace('_', ' ').title(),
+            project_name=project_name,
+            research_title=research_type.title(),
+            created=created or datetime.now().strftime(TIMESTAMP_FORMAT)
+        )
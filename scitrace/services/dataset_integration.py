@@ -5,15 +5,95 @@ Handles integration between projects and DataLad datasets.
 """
 
 import os
-from typing import Dict, List, Any, Optional
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Iterator
 
+from sqlalchemy import bindparam, update
+
+from ..services.background_jobs import get_job, start_job
 from ..services.base_service import BaseService
 from ..services.dataset_creation import DatasetCreationService
 from ..services.file_operations import FileOperationsService
-from ..services.git_operations import GitOperationsService
+from ..services.git_operations import GitOperationsService, _path_exists_cached
 from ..services.metadata_operations import MetadataOperationsService
 from ..exceptions import ProjectError, DatasetError, ValidationError
 
+# Characters in project names that cannot appear in a dataset directory name
+_DATASET_NAME_TRANS = str.maketrans({' ': '_', '/': '_', '\\': '_', ':': '_'})
+
+# Dataset paths keyed by project ID: project_id -> (timestamp, dataset_path)
+DATASET_PATH_CACHE_TTL = 60
+DATASET_PATH_CACHE_MAX_ENTRIES = 1024
+_DATASET_PATH_CACHE = OrderedDict()
+_DATASET_PATH_CACHE_LOCK = threading.Lock()
+
+# Dataset info and summary keyed by dataset path, each pinned to the git state it was built from
+DATASET_INFO_CACHE_MAX_ENTRIES = 512
+_DATASET_INFO_CACHE = OrderedDict()
+_DATASET_INFO_CACHE_LOCK = threading.Lock()
+
+# Shared pool for per-dataset work in the multi-project methods; datasets
+# are disjoint repositories, so their git/datalad calls can overlap
+DATASET_WORKERS = int(os.environ.get('SCITRACE_JOBS', '8'))
+_DATASET_EXECUTOR = ThreadPoolExecutor(max_workers=DATASET_WORKERS)
+
+# Background dataset creation jobs; DataLad create plus the sample content
+# commit can take several seconds
+DATASET_JOB_WORKERS = 2
+_DATASET_JOB_EXECUTOR = ThreadPoolExecutor(max_workers=DATASET_JOB_WORKERS)
+
+
+def clear_dataset_path_cache(project_id: str = None) -> None:
+    """Drop the cached dataset path of a project, or of every project."""
+    with _DATASET_PATH_CACHE_LOCK:
+        if project_id is None:
+            _DATASET_PATH_CACHE.clear()
+        else:
+            _DATASET_PATH_CACHE.pop(project_id, None)
+
+
+def _drop_dataset_info(dataset_path: str) -> None:
+    """Forget the cached info of a dataset that was just changed."""
+    with _DATASET_INFO_CACHE_LOCK:
+        _DATASET_INFO_CACHE.pop(dataset_path, None)
+
+
+def _cache_dataset_path(project_id: str, dataset_path: str) -> None:
+    """Remember a project's dataset path, evicting the least recently used entries."""
+    with _DATASET_PATH_CACHE_LOCK:
+        _DATASET_PATH_CACHE[project_id] = (time.monotonic(), dataset_path)
+        _DATASET_PATH_CACHE.move_to_end(project_id)
+        while len(_DATASET_PATH_CACHE) > DATASET_PATH_CACHE_MAX_ENTRIES:
+            _DATASET_PATH_CACHE.popitem(last=False)
+
+
+def _wrap_project_error(message: str):
+    """
+    Decorator that reports unexpected failures of a service method as ProjectError.
+    
+    SciTrace's own project, dataset and validation errors pass through
+    unchanged; anything else is raised as ProjectError("<message>: <error>").
+    
+    Args:
+        message: Description of the failed operation
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except (ProjectError, DatasetError, ValidationError):
+                raise
+            except Exception as e:
+                raise ProjectError(f"{message}: {str(e)}") from e
+        return wrapper
+    return decorator
+
 
 class DatasetIntegrationService(BaseService):
     """Service for integrating projects with DataLad datasets."""
@@ -25,6 +105,7 @@ class DatasetIntegrationService(BaseService):
         self.git_operations = GitOperationsService(db)
         self.metadata_operations = MetadataOperationsService(db)
     
+    @_wrap_project_error("Failed to create dataset for project")
     def create_dataset_for_project(self, project_id: str, project_name: str, research_type: str = "general") -> Dict[str, Any]:
         """
         Create a DataLad dataset for a project.
@@ -41,32 +122,118 @@ class DatasetIntegrationService(BaseService):
             ProjectError: If project operation fails
             DatasetError: If dataset creation fails
         """
-        try:
-            # Generate dataset path
-            dataset_path = self._generate_dataset_path(project_id, project_name)
-            
-            # Create the dataset
-            result = self.dataset_creation.create_dataset_with_content(
-                dataset_path, 
-                project_name, 
-                research_type
+        creation = self._create_project_dataset(project_id, project_name, research_type)
+        
+        # Update project with dataset path
+        self._update_project_dataset_path(project_id, creation['dataset_path'])
+        
+        return creation
+    
+    @_wrap_project_error("Failed to create datasets for projects")
+    def create_datasets_for_projects(self, projects: List[Dict[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Create DataLad datasets for several projects at once.
+        
+        The datasets are created concurrently and the new dataset paths are
+        recorded together in one update. A failure for one project does not
+        stop the others; its entry carries the error instead.
+        
+        Args:
+            projects: Dicts with 'project_id', 'project_name' and optionally
+                'research_type'
+        
+        Returns:
+            Dict mapping each project ID to its creation result, as returned
+            by create_dataset_for_project, or to {'success': False, 'error': ...}
+        """
+        futures = {
+            project['project_id']: _DATASET_EXECUTOR.submit(
+                self._create_project_dataset, project['project_id'], project['project_name'],
+                project.get('research_type', 'general')
             )
-            
-            # Update project with dataset path
-            self._update_project_dataset_path(project_id, dataset_path)
-            
-            return {
-                'project_id': project_id,
-                'dataset_path': dataset_path,
-                'dataset_name': project_name,
-                'research_type': research_type,
-                'creation_result': result,
-                'success': True
-            }
-            
-        except Exception as e:
-            raise ProjectError(f"Failed to create dataset for project: {str(e)}")
+            for project in projects
+        }
+        
+        results = {}
+        for project_id, future in futures.items():
+            try:
+                results[project_id] = future.result()
+            except Exception as e:
+                results[project_id] = {'project_id': project_id, 'success': False, 'error': str(e)}
+        
+        # Update projects with their dataset paths
+        self._update_projects_dataset_paths({
+            project_id: creation['dataset_path']
+            for project_id, creation in results.items() if creation['success']
+        })
+        
+        return results
     
+    def _create_project_dataset(self, project_id: str, project_name: str, research_type: str) -> Dict[str, Any]:
+        """Create a project's dataset without recording its path on the project."""
+        # Generate dataset path
+        dataset_path = self._generate_dataset_path(project_id, project_name)
+        
+        # Create the dataset
+        result = self.dataset_creation.create_dataset_with_content(
+            dataset_path, 
+            project_name, 
+            research_type
+        )
+        
+        return {
+            'project_id': project_id,
+            'dataset_path': dataset_path,
+            'dataset_name': project_name,
+            'research_type': research_type,
+            'creation_result': result,
+            'success': True
+        }
+    
+    def start_dataset_creation_for_project(self, project_id: str, project_name: str,
+                                           research_type: str = "general") -> Dict[str, Any]:
+        """
+        Start creating a DataLad dataset for a project in the background.
+        
+        If the project's dataset is already being created, the running job is
+        returned instead of starting another.
+        
+        Args:
+            project_id: Project ID
+            project_name: Project name
+            research_type: Type of research
+        
+        Returns:
+            Dict with the job ID and its status ('running')
+        """
+        job_id, _ = start_job('dataset', _DATASET_JOB_EXECUTOR, self.create_dataset_for_project,
+                              project_id, project_name, research_type,
+                              project_id=project_id, unique=True)
+        return {'project_id': project_id, 'job_id': job_id, 'status': 'running'}
+    
+    def get_dataset_creation_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the state of a background dataset creation job.
+        
+        Args:
+            job_id: Job ID returned by start_dataset_creation_for_project
+        
+        Returns:
+            Dict with the job status ('running', 'done' or 'failed') and, once
+            finished, its result or error; None if the job is unknown or expired
+        """
+        job = get_job(job_id, 'dataset')
+        if job is None:
+            return None
+        
+        status = {'project_id': job['project_id'], 'status': job['status']}
+        if job['status'] == 'done':
+            status['result'] = job['result']
+        elif job['status'] == 'failed':
+            status['error'] = job['error']
+        return status
+    
+    @_wrap_project_error("Failed to get project dataset info")
     def get_project_dataset_info(self, project_id: str) -> Dict[str, Any]:
         """
         Get dataset information for a project.
@@ -81,32 +248,79 @@ class DatasetIntegrationService(BaseService):
             ProjectError: If project not found
             DatasetError: If dataset not found
         """
-        try:
-            # Get project dataset path
-            dataset_path = self._get_project_dataset_path(project_id)
-            
-            if not dataset_path or not os.path.exists(dataset_path):
-                return {
-                    'project_id': project_id,
-                    'has_dataset': False,
-                    'dataset_path': None
-                }
-            
-            # Get dataset information
-            dataset_info = self.metadata_operations.get_dataset_info(dataset_path)
-            dataset_summary = self.metadata_operations.get_dataset_summary(dataset_path)
-            
+        # Get project dataset path
+        dataset_path = self._get_project_dataset_path(project_id)
+        
+        return self._build_dataset_info(project_id, dataset_path)
+    
+    @_wrap_project_error("Failed to get projects dataset info")
+    def get_projects_dataset_info(self, project_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get dataset information for several projects at once.
+        
+        The dataset paths are resolved in one lookup and the per-dataset
+        metadata is gathered concurrently.
+        
+        Args:
+            project_ids: Project IDs
+        
+        Returns:
+            Dict mapping each project ID to the same information
+            get_project_dataset_info returns for it
+        
+        Raises:
+            ProjectError: If a project operation fails
+        """
+        dataset_paths = self._get_project_dataset_paths(project_ids)
+        futures = {
+            project_id: _DATASET_EXECUTOR.submit(self._build_dataset_info, project_id, dataset_path)
+            for project_id, dataset_path in dataset_paths.items()
+        }
+        return {project_id: future.result() for project_id, future in futures.items()}
+    
+    def _build_dataset_info(self, project_id: str, dataset_path: Optional[str]) -> Dict[str, Any]:
+        """Gather the dataset information of one project from its dataset path."""
+        if not dataset_path or not _path_exists_cached(dataset_path):
             return {
                 'project_id': project_id,
-                'has_dataset': True,
-                'dataset_path': dataset_path,
-                'dataset_info': dataset_info,
-                'dataset_summary': dataset_summary
+                'has_dataset': False,
+                'dataset_path': None
             }
+        
+        # Reuse the info while HEAD and the working-tree status are unchanged
+        state = self.metadata_operations._get_dataset_state(dataset_path)
+        cached = None
+        if state:
+            with _DATASET_INFO_CACHE_LOCK:
+                cached = _DATASET_INFO_CACHE.get(dataset_path)
+                if cached and cached[0] == state:
+                    _DATASET_INFO_CACHE.move_to_end(dataset_path)
+                else:
+                    cached = None
+        
+        if cached:
+            dataset_info, dataset_summary = copy.deepcopy(cached[1])
+        else:
+            # Get dataset information
+            dataset_info = self.metadata_operations.get_dataset_info(dataset_path)
+            dataset_summary = self.metadata_operations.get_dataset_summary(dataset_path)
             
-        except Exception as e:
-            raise ProjectError(f"Failed to get project dataset info: {str(e)}")
+            if state:
+                with _DATASET_INFO_CACHE_LOCK:
+                    _DATASET_INFO_CACHE[dataset_path] = (state, copy.deepcopy((dataset_info, dataset_summary)))
+                    _DATASET_INFO_CACHE.move_to_end(dataset_path)
+                    while len(_DATASET_INFO_CACHE) > DATASET_INFO_CACHE_MAX_ENTRIES:
+                        _DATASET_INFO_CACHE.popitem(last=False)
+        
+        return {
+            'project_id': project_id,
+            'has_dataset': True,
+            'dataset_path': dataset_path,
+            'dataset_info': dataset_info,
+            'dataset_summary': dataset_summary
+        }
     
+    @_wrap_project_error("Failed to get project dataflow")
     def get_project_dataflow(self, project_id: str) -> Dict[str, Any]:
         """
         Get dataflow visualization for a project's dataset.
@@ -121,30 +335,27 @@ class DatasetIntegrationService(BaseService):
             ProjectError: If project not found
             DatasetError: If dataset not found
         """
-        try:
-            # Get project dataset path
-            dataset_path = self._get_project_dataset_path(project_id)
-            
-            if not dataset_path or not os.path.exists(dataset_path):
-                return {
-                    'project_id': project_id,
-                    'has_dataset': False,
-                    'dataflow': None
-                }
-            
-            # Create dataflow from dataset
-            dataflow = self.metadata_operations.create_dataflow_from_dataset(dataset_path)
-            
+        # Get project dataset path
+        dataset_path = self._get_project_dataset_path(project_id)
+        
+        if not dataset_path or not _path_exists_cached(dataset_path):
             return {
                 'project_id': project_id,
-                'has_dataset': True,
-                'dataset_path': dataset_path,
-                'dataflow': dataflow
+                'has_dataset': False,
+                'dataflow': None
             }
-            
-        except Exception as e:
-            raise ProjectError(f"Failed to get project dataflow: {str(e)}")
+        
+        # Create dataflow from dataset
+        dataflow = self.metadata_operations.create_dataflow_from_dataset(dataset_path)
+        
+        return {
+            'project_id': project_id,
+            'has_dataset': True,
+            'dataset_path': dataset_path,
+            'dataflow': dataflow
+        }
     
+    @_wrap_project_error("Failed to get project commit history")
     def get_project_commit_history(self, project_id: str, file_path: str = None, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get commit history for a project's dataset.
@@ -161,24 +372,72 @@ class DatasetIntegrationService(BaseService):
             ProjectError: If project not found
             DatasetError: If dataset not found
         """
+        # Get project dataset path
+        dataset_path = self._get_project_dataset_path(project_id)
+        
+        if not dataset_path or not _path_exists_cached(dataset_path):
+            return []
+        
+        # Get commit history
+        if file_path:
+            commits = self.git_operations.get_file_commit_history(dataset_path, file_path, limit)
+        else:
+            commits = self.git_operations.get_commit_history(dataset_path, limit=limit)
+        
+        return commits
+    
+    def iter_project_commit_history(self, project_id: str, file_path: str = None,
+                                    limit: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield commit history for a project's dataset as git produces it.
+        
+        Args:
+            project_id: Project ID
+            file_path: Optional specific file path
+            limit: Maximum number of commits, or None for the whole history
+        
+        Returns:
+            Iterator over commit information; empty if the project has no dataset
+        
+        Raises:
+            ProjectError: If project not found
+        """
         try:
             # Get project dataset path
             dataset_path = self._get_project_dataset_path(project_id)
             
-            if not dataset_path or not os.path.exists(dataset_path):
-                return []
+            if not dataset_path or not _path_exists_cached(dataset_path):
+                return
             
-            # Get commit history
-            if file_path:
-                commits = self.git_operations.get_file_commit_history(dataset_path, file_path, limit)
-            else:
-                commits = self.git_operations.get_commit_history(dataset_path, limit=limit)
-            
-            return commits
+            yield from self.git_operations.iter_commit_history(dataset_path, file_path, limit)
             
+        # Generators run after the call returns, so they cannot use _wrap_project_error
+        except (ProjectError, DatasetError, ValidationError):
+            raise
         except Exception as e:
-            raise ProjectError(f"Failed to get project commit history: {str(e)}")
+            raise ProjectError(f"Failed to get project commit history: {str(e)}") from e
+    
+    @_wrap_project_error("Failed to get projects commit history")
+    def get_projects_commit_history(self, project_ids: List[str], limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get commit history for the datasets of several projects at once.
+        
+        Args:
+            project_ids: Project IDs
+            limit: Maximum number of commits to return per project
+        
+        Returns:
+            Dict mapping each project ID to its list of commit information
+        
+        Raises:
+            ProjectError: If a project operation fails
+        """
+        histories = self._for_each_dataset(
+            project_ids, lambda dataset_path: self.git_operations.get_commit_history(dataset_path, limit=limit)
+        )
+        return {project_id: commits or [] for project_id, commits in histories.items()}
     
+    @_wrap_project_error("Failed to restore project file")
     def restore_project_file(self, project_id: str, file_path: str, commit_hash: str, commit_message: str = None) -> Dict[str, Any]:
         """
         Restore a file in a project's dataset to a specific commit.
@@ -196,32 +455,30 @@ class DatasetIntegrationService(BaseService):
             ProjectError: If project not found
             DatasetError: If dataset not found
         """
-        try:
-            # Get project dataset path
-            dataset_path = self._get_project_dataset_path(project_id)
-            
-            if not dataset_path or not os.path.exists(dataset_path):
-                raise ProjectError(f"Project {project_id} does not have a dataset")
-            
-            # Restore the file
-            result = self.git_operations.restore_file_to_commit(
-                dataset_path, 
-                file_path, 
-                commit_hash, 
-                commit_message
-            )
-            
-            return {
-                'project_id': project_id,
-                'file_path': file_path,
-                'commit_hash': commit_hash,
-                'restoration_result': result,
-                'success': True
-            }
-            
-        except Exception as e:
-            raise ProjectError(f"Failed to restore project file: {str(e)}")
+        # Get project dataset path
+        dataset_path = self._get_project_dataset_path(project_id)
+        
+        if not dataset_path or not _path_exists_cached(dataset_path):
+            raise ProjectError(f"Project {project_id} does not have a dataset")
+        
+        # Restore the file
+        result = self.git_operations.restore_file_to_commit(
+            dataset_path, 
+            file_path, 
+            commit_hash, 
+            commit_message
+        )
+        _drop_dataset_info(dataset_path)
+        
+        return {
+            'project_id': project_id,
+            'file_path': file_path,
+            'commit_hash': commit_hash,
+            'restoration_result': result,
+            'success': True
+        }
     
+    @_wrap_project_error("Failed to get project file tree")
     def get_project_file_tree(self, project_id: str) -> List[Dict[str, Any]]:
         """
         Get file tree structure for a project's dataset.
@@ -236,21 +493,35 @@ class DatasetIntegrationService(BaseService):
             ProjectError: If project not found
             DatasetError: If dataset not found
         """
-        try:
-            # Get project dataset path
-            dataset_path = self._get_project_dataset_path(project_id)
-            
-            if not dataset_path or not os.path.exists(dataset_path):
-                return []
-            
-            # Get file tree
-            file_tree = self.file_operations.get_file_tree(dataset_path)
-            
-            return file_tree
-            
-        except Exception as e:
-            raise ProjectError(f"Failed to get project file tree: {str(e)}")
+        # Get project dataset path
+        dataset_path = self._get_project_dataset_path(project_id)
+        
+        if not dataset_path or not _path_exists_cached(dataset_path):
+            return []
+        
+        # Get file tree
+        file_tree = self.file_operations.get_file_tree(dataset_path)
+        
+        return file_tree
+    
+    @_wrap_project_error("Failed to get projects file tree")
+    def get_projects_file_tree(self, project_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get file tree structures for the datasets of several projects at once.
+        
+        Args:
+            project_ids: Project IDs
+        
+        Returns:
+            Dict mapping each project ID to its file tree structure
+        
+        Raises:
+            ProjectError: If a project operation fails
+        """
+        file_trees = self._for_each_dataset(project_ids, self.file_operations.get_file_tree)
+        return {project_id: file_tree or [] for project_id, file_tree in file_trees.items()}
     
+    @_wrap_project_error("Failed to get project stage files")
     def get_project_stage_files(self, project_id: str, stage_name: str) -> Optional[Dict[str, Any]]:
         """
         Get files for a specific stage in a project's dataset.
@@ -266,21 +537,18 @@ class DatasetIntegrationService(BaseService):
             ProjectError: If project not found
             DatasetError: If dataset not found
         """
-        try:
-            # Get project dataset path
-            dataset_path = self._get_project_dataset_path(project_id)
-            
-            if not dataset_path or not os.path.exists(dataset_path):
-                return None
-            
-            # Get stage files
-            stage_files = self.file_operations.get_stage_files(dataset_path, stage_name)
-            
-            return stage_files
-            
-        except Exception as e:
-            raise ProjectError(f"Failed to get project stage files: {str(e)}")
+        # Get project dataset path
+        dataset_path = self._get_project_dataset_path(project_id)
+        
+        if not dataset_path or not _path_exists_cached(dataset_path):
+            return None
+        
+        # Get stage files
+        stage_files = self.file_operations.get_stage_files(dataset_path, stage_name)
+        
+        return stage_files
     
+    @_wrap_project_error("Failed to save project stage changes")
     def save_project_stage_changes(self, project_id: str, stage_name: str, commit_message: str = None) -> Dict[str, Any]:
         """
         Save changes in a stage of a project's dataset.
@@ -297,50 +565,120 @@ class DatasetIntegrationService(BaseService):
             ProjectError: If project not found
             DatasetError: If dataset not found
         """
-        try:
-            # Get project dataset path
-            dataset_path = self._get_project_dataset_path(project_id)
-            
-            if not dataset_path or not os.path.exists(dataset_path):
-                raise ProjectError(f"Project {project_id} does not have a dataset")
-            
-            # Save stage changes
-            result = self.file_operations.save_stage_changes(
-                dataset_path, 
-                stage_name, 
-                commit_message
-            )
-            
-            return {
-                'project_id': project_id,
-                'stage_name': stage_name,
-                'save_result': result,
-                'success': True
-            }
-            
-        except Exception as e:
-            raise ProjectError(f"Failed to save project stage changes: {str(e)}")
+        # Get project dataset path
+        dataset_path = self._get_project_dataset_path(project_id)
+        
+        if not dataset_path or not _path_exists_cached(dataset_path):
+            raise ProjectError(f"Project {project_id} does not have a dataset")
+        
+        # Save stage changes
+        result = self.file_operations.save_stage_changes(
+            dataset_path, 
+            stage_name, 
+            commit_message
+        )
+        _drop_dataset_info(dataset_path)
+        
+        return {
+            'project_id': project_id,
+            'stage_name': stage_name,
+            'save_result': result,
+            'success': True
+        }
+    
+    def _for_each_dataset(self, project_ids: List[str], operation) -> Dict[str, Any]:
+        """
+        Run an operation on the datasets of several projects concurrently.
+        
+        Args:
+            project_ids: Project IDs
+            operation: Callable taking a dataset path
+        
+        Returns:
+            Dict mapping each project ID to the operation's result, or to
+            None if the project has no dataset
+        """
+        futures = {
+            project_id: _DATASET_EXECUTOR.submit(operation, dataset_path)
+            for project_id, dataset_path in self._get_project_dataset_paths(project_ids).items()
+            if dataset_path and _path_exists_cached(dataset_path)
+        }
+        results = dict.fromkeys(project_ids)
+        for project_id, future in futures.items():
+            results[project_id] = future.result()
+        return results
     
     def _generate_dataset_path(self, project_id: str, project_name: str) -> str:
         """Generate dataset path for a project."""
-        # Get base path from environment or use default
-        home_dir = os.path.expanduser("~")
-        base_path = os.environ.get('DATALAD_BASE_PATH', os.path.join(home_dir, 'scitrace_demo_datasets'))
-        
-        # Create project-specific directory
-        project_dir = f"{project_id}_{project_name.replace(' ', '_')}"
-        dataset_path = os.path.join(base_path, project_dir)
+        # Create project-specific directory under the base path the creation
+        # service resolved from the environment when it was constructed
+        project_dir = f"{project_id}_{project_name.translate(_DATASET_NAME_TRANS)}"
+        dataset_path = os.path.join(self.dataset_creation.base_path, project_dir)
         
         return dataset_path
     
     def _get_project_dataset_path(self, project_id: str) -> Optional[str]:
         """Get dataset path for a project."""
-        # This would typically query the database
-        # For now, return None as placeholder
-        return None
+        return self._get_project_dataset_paths([project_id])[project_id]
+    
+    def _get_project_dataset_paths(self, project_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Get dataset paths for several projects, looking up all cache misses together."""
+        dataset_paths = {}
+        missing = []
+        
+        # Paths seen in the last DATASET_PATH_CACHE_TTL seconds skip the lookup
+        now = time.monotonic()
+        with _DATASET_PATH_CACHE_LOCK:
+            for project_id in project_ids:
+                cached = _DATASET_PATH_CACHE.get(project_id)
+                if cached and now - cached[0] < DATASET_PATH_CACHE_TTL:
+                    _DATASET_PATH_CACHE.move_to_end(project_id)
+                    dataset_paths[project_id] = cached[1]
+                else:
+                    dataset_paths[project_id] = None
+                    missing.append(project_id)
+        
+        if missing:
+            from ..models import Project
+            
+            # One query for all missing projects (project_id IN missing)
+            rows = (Project.query
+                    .with_entities(Project.project_id, Project.dataset_path)
+                    .filter(Project.project_id.in_(missing))
+                    .all())
+            
+            # Only found paths are cached, so a project whose dataset is
+            # created later is not hidden behind a cached miss
+            for project_id, dataset_path in rows:
+                if dataset_path:
+                    dataset_paths[project_id] = dataset_path
+                    _cache_dataset_path(project_id, dataset_path)
+        
+        return dataset_paths
     
     def _update_project_dataset_path(self, project_id: str, dataset_path: str) -> None:
         """Update project with dataset path."""
-        # This would typically update the database
-        # For now, do nothing as placeholder
-        pass
+        self._update_projects_dataset_paths({project_id: dataset_path})
+    
+    def _update_projects_dataset_paths(self, dataset_paths: Dict[str, str]) -> None:
+        """Update several projects with their dataset paths in one write."""
+        if not dataset_paths:
+            return
+        
+        from ..models import Project, db
+        
+        # One executemany UPDATE keyed by project ID, committed once. It runs
+        # against the table because ORM bulk UPDATE only keys on the primary
+        # key; the commit expires any loaded projects
+        project_table = Project.__table__
+        stmt = (update(project_table)
+                .where(project_table.c.project_id == bindparam('b_project_id'))
+                .values(dataset_path=bindparam('b_dataset_path')))
+        db.session.execute(stmt, [
+            {'b_project_id': project_id, 'b_dataset_path': dataset_path}
+            for project_id, dataset_path in dataset_paths.items()
+        ])
+        db.session.commit()
+        
+        for project_id, dataset_path in dataset_paths.items():
+            _cache_dataset_path(project_id, dataset_path)
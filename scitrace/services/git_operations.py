@@ -5,12 +5,54 @@ Handles Git operations within DataLad datasets.
 """
 
 import os
+import re
 import subprocess
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
 
 from ..exceptions import GitOperationError, DatasetError, ValidationError
 from .base_service import BaseService
+from ..utils.validation_utils import parse_iso_datetime
+
+# Commit SHAs accepted as pagination cursors (also keeps option-like values out of argv)
+_SHA_RE = re.compile(r'^[0-9a-fA-F]{4,40}$')
+
+# Diffs keyed by (dataset_path, full_sha, file_path); a full SHA pins the output, so entries never go stale
+_FULL_SHA_RE = re.compile(r'^[0-9a-f]{40}$')
+DIFF_CACHE_MAX_ENTRIES = 1024
+DIFF_CACHE_MAX_ENTRY_SIZE = 1024 * 1024
+_DIFF_CACHE = OrderedDict()
+_DIFF_CACHE_LOCK = threading.Lock()
+
+# Dataset paths recently seen to exist, mapped to when they were checked
+PATH_EXISTS_TTL = 30
+_PATH_OK = {}
+
+
+def _path_exists_cached(path: str, ttl: float = PATH_EXISTS_TTL) -> bool:
+    """Like os.path.exists, but remembers positive results for ttl seconds."""
+    now = time.monotonic()
+    checked_at = _PATH_OK.get(path)
+    if checked_at is not None and now - checked_at < ttl:
+        return True
+    if os.path.exists(path):
+        _PATH_OK[path] = now
+        return True
+    _PATH_OK.pop(path, None)
+    return False
+
+
+# git log format for get_detailed_git_log: NUL between fields, RS after each commit
+_DETAILED_LOG_FIELDS = ('full_hash', 'short_hash', 'author_name', 'author_email', 'date', 'message', 'body')
+_DETAILED_LOG_FORMAT = '%H%x00%h%x00%an%x00%ae%x00%ad%x00%s%x00%b%x1e'
+
+# Parsed git log pages keyed by dataset path; each entry is pinned to the HEAD it was built from
+LOG_CACHE_MAX_DATASETS = 32
+_LOG_CACHE = OrderedDict()
+_LOG_CACHE_LOCK = threading.Lock()
 
 
 class GitOperationsService(BaseService):
@@ -66,73 +108,169 @@ class GitOperationsService(BaseService):
         except subprocess.CalledProcessError as e:
             raise GitOperationError(f"Failed to get commit history: {e.stderr}", command=cmd)
     
-    def get_detailed_git_log(self, dataset_path: str, limit: int = 50) -> List[Dict[str, Any]]:
+    def iter_commit_history(self, dataset_path: str, file_path: str = None, limit: int = None,
+                            chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+        """
+        Yield git commit history for a dataset or specific file as git reports it.
+        
+        Reads NUL-delimited ``git log -z`` output in chunks, so commits reach
+        the caller before git has finished and memory stays bounded by the
+        chunk size. Each commit has the same fields as in get_commit_history,
+        with the full hash taken from the same git log call.
+        
+        Args:
+            dataset_path: Path to the dataset
+            file_path: Optional specific file path, followed across renames
+            limit: Maximum number of commits, or None for the whole history
+            chunk_size: Number of bytes read from git at a time
+        
+        Returns:
+            Iterator over commit information dictionaries
+        
+        Raises:
+            GitOperationError: If git operation fails
+            DatasetError: If dataset is invalid
+        """
+        if not os.path.exists(dataset_path):
+            raise DatasetError(f"Dataset path does not exist: {dataset_path}", dataset_path=dataset_path)
+        
+        cmd = ['git', 'log', '-z', '--pretty=format:%h%x00%H%x00%s']
+        if limit is not None:
+            cmd += ['-n', str(limit)]
+        if file_path:
+            cmd += ['--follow', '--', file_path]
+        proc = subprocess.Popen(cmd, cwd=dataset_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        
+        try:
+            # -z ends each commit with a NUL as well, so every commit is three tokens
+            tokens = self._iter_nul_tokens(proc.stdout, chunk_size)
+            for commit_hash in tokens:
+                full_hash = next(tokens, None)
+                message = next(tokens, None)
+                if message is None:
+                    break
+                yield {
+                    'hash': commit_hash,
+                    'message': message,
+                    'full_hash': full_hash
+                }
+            
+            if proc.wait() != 0:
+                stderr = proc.stderr.read().decode(errors='replace')
+                raise GitOperationError(f"Failed to get commit history: {stderr}", command=cmd,
+                                        returncode=proc.returncode, stderr=stderr)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+    
+    def get_detailed_git_log(self, dataset_path: str, limit: int = 50,
+                             before_sha: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Get detailed git log information for comprehensive visualization.
         
+        Pages are cached per HEAD, so walking back through history with
+        ``before_sha`` only parses each page once until HEAD moves.
+        
         Args:
             dataset_path: Path to the dataset
             limit: Maximum number of commits to return
+            before_sha: Optional cursor; return commits after this one in log order
         
         Returns:
             List of detailed commit information
         
         Raises:
             GitOperationError: If git operation fails
+            ValidationError: If before_sha is not a commit hash
         """
-        if not os.path.exists(dataset_path):
+        if not _path_exists_cached(dataset_path):
             raise DatasetError(f"Dataset path does not exist: {dataset_path}", dataset_path=dataset_path)
         
+        if before_sha is not None and not _SHA_RE.match(before_sha):
+            raise ValidationError(f"Invalid commit cursor: {before_sha}", field='cursor', value=before_sha)
+        
         try:
-            # Get detailed git log with author, date, and commit info
-            cmd = [
-                'git', 'log', 
-                '--pretty=format:%H|%h|%an|%ae|%ad|%s|%b',
-                '--date=iso',
-                '-n', str(limit)
-            ]
-            
-            result = subprocess.run(cmd, cwd=dataset_path, capture_output=True, text=True, check=True)
+            tip = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=dataset_path,
+                                 capture_output=True, text=True, check=True).stdout.strip()
+        except subprocess.CalledProcessError as e:
+            raise GitOperationError(f"Failed to get detailed git log: {e.stderr}", command=['git', 'rev-parse', 'HEAD'])
+        except FileNotFoundError:
+            # The cached existence check can outlive a deleted dataset
+            _PATH_OK.pop(dataset_path, None)
+            raise DatasetError(f"Dataset path does not exist: {dataset_path}", dataset_path=dataset_path)
+        
+        page_key = (before_sha, limit)
+        with _LOG_CACHE_LOCK:
+            cached = _LOG_CACHE.get(dataset_path)
+            entries = cached[1].get(page_key) if cached and cached[0] == tip else None
+        
+        if entries is None:
+            entries = self._read_git_log_page(dataset_path, limit, before_sha)
+            with _LOG_CACHE_LOCK:
+                cached = _LOG_CACHE.get(dataset_path)
+                if not cached or cached[0] != tip:
+                    cached = (tip, {})
+                    _LOG_CACHE[dataset_path] = cached
+                _LOG_CACHE.move_to_end(dataset_path)
+                cached[1][page_key] = entries
+                while len(_LOG_CACHE) > LOG_CACHE_MAX_DATASETS:
+                    _LOG_CACHE.popitem(last=False)
+        
+        # Relative dates depend on the current time, so they are not cached
+        commits = []
+        for parsed_date, commit in entries:
+            commit = dict(commit)
+            commit['relative_date'] = self._get_relative_date(parsed_date) if parsed_date else "Unknown"
+            commits.append(commit)
+        
+        return commits
+    
+    def _read_git_log_page(self, dataset_path: str, limit: int,
+                           before_sha: Optional[str]) -> List[tuple]:
+        """Run git log for one page and return (parsed_date, commit) pairs."""
+        # Start at the cursor and drop it, so pages never overlap
+        cmd = [
+            'git', 'log', 
+            f'--pretty=format:{_DETAILED_LOG_FORMAT}',
+            '--date=iso',
+            '-n', str(limit + 1 if before_sha else limit)
+        ]
+        if before_sha:
+            cmd.append(before_sha)
+        
+        try:
+            result = subprocess.run(cmd, cwd=dataset_path, capture_output=True, check=True)
+        except subprocess.CalledProcessError as e:
+            raise GitOperationError(f"Failed to get detailed git log: {e.stderr.decode('utf-8', 'replace')}", command=cmd)
+        
+        # Decode once and split on the record/field separators; bodies may span lines or contain '|'
+        output = result.stdout.decode('utf-8', 'replace')
+        entries = []
+        for record in output.split('\x1e'):
+            parts = record.lstrip('\n').split('\x00')
+            if len(parts) != len(_DETAILED_LOG_FIELDS):
+                continue
             
-            commits = []
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    # Split by | delimiter
-                    parts = line.split('|')
-                    if len(parts) >= 6:
-                        full_hash = parts[0]
-                        short_hash = parts[1]
-                        author_name = parts[2]
-                        author_email = parts[3]
-                        date = parts[4]
-                        message = parts[5]
-                        body = parts[6] if len(parts) > 6 else ""
-                        
-                        # Parse date
-                        try:
-                            parsed_date = datetime.fromisoformat(date.replace('Z', '+00:00'))
-                            formatted_date = parsed_date.strftime('%d. %b %Y at %H:%M')
-                            relative_date = self._get_relative_date(parsed_date)
-                        except:
-                            formatted_date = date
-                            relative_date = "Unknown"
-                        
-                        commits.append({
-                            'full_hash': full_hash,
-                            'short_hash': short_hash,
-                            'author_name': author_name,
-                            'author_email': author_email,
-                            'date': date,
-                            'formatted_date': formatted_date,
-                            'relative_date': relative_date,
-                            'message': message,
-                            'body': body
-                        })
+            commit = dict(zip(_DETAILED_LOG_FIELDS, parts))
+            commit['body'] = commit['body'].strip()
             
-            return commits
+            # Parse date
+            try:
+                parsed_date = parse_iso_datetime(commit['date'])
+                commit['formatted_date'] = parsed_date.strftime('%d. %b %Y at %H:%M')
+            except ValueError:
+                parsed_date = None
+                commit['formatted_date'] = commit['date']
             
-        except subprocess.CalledProcessError as e:
-            raise GitOperationError(f"Failed to get detailed git log: {e.stderr}", command=cmd)
+            entries.append((parsed_date, commit))
+        
+        if before_sha and entries and entries[0][1]['full_hash'].startswith(before_sha.lower()):
+            entries = entries[1:]
+        
+        return entries[:limit]
     
     def get_file_commit_history(self, dataset_path: str, file_path: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -323,15 +461,30 @@ class GitOperationsService(BaseService):
         if not os.path.exists(dataset_path):
             raise DatasetError(f"Dataset path does not exist: {dataset_path}", dataset_path=dataset_path)
         
+        # Only full SHAs are cached; refs like HEAD can point elsewhere next time
+        cache_key = (dataset_path, commit_hash, file_path) if _FULL_SHA_RE.match(commit_hash) else None
+        if cache_key:
+            with _DIFF_CACHE_LOCK:
+                diff = _DIFF_CACHE.get(cache_key)
+                if diff is not None:
+                    _DIFF_CACHE.move_to_end(cache_key)
+                    return diff
+        
         try:
             # Get the diff for the file
             cmd = ['git', 'show', commit_hash, '--', file_path]
             result = subprocess.run(cmd, cwd=dataset_path, capture_output=True, text=True, check=True)
             
-            return result.stdout
-            
         except subprocess.CalledProcessError as e:
             raise GitOperationError(f"Failed to get file diff: {e.stderr}", command=cmd)
+        
+        if cache_key and len(result.stdout) <= DIFF_CACHE_MAX_ENTRY_SIZE:
+            with _DIFF_CACHE_LOCK:
+                _DIFF_CACHE[cache_key] = result.stdout
+                while len(_DIFF_CACHE) > DIFF_CACHE_MAX_ENTRIES:
+                    _DIFF_CACHE.popitem(last=False)
+        
+        return result.stdout
     
     def get_commit_files(self, dataset_path: str, commit_hash: str) -> List[Dict[str, Any]]:
         """
@@ -344,55 +497,96 @@ class GitOperationsService(BaseService):
         Returns:
             List of file change information
         
+        Raises:
+            GitOperationError: If git operation fails
+        """
+        return list(self.iter_commit_files(dataset_path, commit_hash))
+    
+    def iter_commit_files(self, dataset_path: str, commit_hash: str,
+                          chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+        """
+        Yield files changed in a specific commit as git reports them.
+        
+        Reads NUL-delimited ``git show --name-status -z`` output in chunks, so
+        memory stays bounded by the chunk size rather than the number of files.
+        
+        Args:
+            dataset_path: Path to the dataset
+            commit_hash: Commit hash
+            chunk_size: Number of bytes read from git at a time
+        
+        Returns:
+            Iterator over file change information
+        
         Raises:
             GitOperationError: If git operation fails
         """
         if not os.path.exists(dataset_path):
             raise DatasetError(f"Dataset path does not exist: {dataset_path}", dataset_path=dataset_path)
         
+        # Get files changed in the commit
+        cmd = ['git', 'show', '--name-status', '-z', '--pretty=format:', '--end-of-options', commit_hash]
+        proc = subprocess.Popen(cmd, cwd=dataset_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        
         try:
-            # Get files changed in the commit
-            cmd = ['git', 'show', '--name-status', '--pretty=format:', commit_hash]
-            result = subprocess.run(cmd, cwd=dataset_path, capture_output=True, text=True, check=True)
-            
-            files = []
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    parts = line.split('\t')
-                    if len(parts) == 2:
-                        status = parts[0]
-                        file_path = parts[1]
-                        
-                        # Determine change type
-                        if status == 'A':
-                            change_type = 'Added'
-                        elif status == 'M':
-                            change_type = 'Modified'
-                        elif status == 'D':
-                            change_type = 'Deleted'
-                        elif status == 'R':
-                            change_type = 'Renamed'
-                        else:
-                            change_type = status
-                        
-                        # Get file size if file exists
-                        file_size = None
-                        if status != 'D':  # Not deleted
-                            full_path = os.path.join(dataset_path, file_path)
-                            if os.path.exists(full_path):
-                                file_size = os.path.getsize(full_path)
-                        
-                        files.append({
-                            'path': file_path,
-                            'status': status,
-                            'change_type': change_type,
-                            'size': file_size
-                        })
-            
-            return files
-            
-        except subprocess.CalledProcessError as e:
-            raise GitOperationError(f"Failed to get commit files: {e.stderr}", command=cmd)
+            tokens = self._iter_nul_tokens(proc.stdout, chunk_size)
+            for status in tokens:
+                # Leading newline separates the empty pretty format from the file list
+                status = status.lstrip('\n')
+                if not status:
+                    continue
+                
+                # Renames and copies list the source path first, then the destination
+                if status[0] in ('R', 'C'):
+                    next(tokens, None)
+                file_path = next(tokens, None)
+                if file_path is None:
+                    break
+                
+                # Determine change type
+                change_type = {
+                    'A': 'Added',
+                    'M': 'Modified',
+                    'D': 'Deleted',
+                    'R': 'Renamed',
+                    'C': 'Copied'
+                }.get(status[0], status)
+                
+                # Get file size if file exists
+                file_size = None
+                if status != 'D':  # Not deleted
+                    full_path = os.path.join(dataset_path, file_path)
+                    if os.path.exists(full_path):
+                        file_size = os.path.getsize(full_path)
+                
+                yield {
+                    'path': file_path,
+                    'status': status[0],
+                    'change_type': change_type,
+                    'size': file_size
+                }
+            
+            if proc.wait() != 0:
+                stderr = proc.stderr.read().decode(errors='replace')
+                raise GitOperationError(f"Failed to get commit files: {stderr}", command=cmd,
+                                        returncode=proc.returncode, stderr=stderr)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+    
+    @staticmethod
+    def _iter_nul_tokens(stream, chunk_size: int) -> Iterator[str]:
+        """Yield NUL-terminated tokens from a binary stream, decoded as UTF-8."""
+        pending = b''
+        for chunk in iter(lambda: stream.read(chunk_size), b''):
+            *tokens, pending = (pending + chunk).split(b'\x00')
+            for token in tokens:
+                yield token.decode('utf-8', 'replace')
+        if pending:
+            yield pending.decode('utf-8', 'replace')
     
     def get_file_content_at_commit(self, dataset_path: str, commit_hash: str, file_path: str) -> str:
         """
@@ -422,6 +616,54 @@ class GitOperationsService(BaseService):
         except subprocess.CalledProcessError as e:
             raise GitOperationError(f"Failed to get file content: {e.stderr}", command=cmd)
     
+    def stream_file_content_at_commit(self, dataset_path: str, commit_hash: str, file_path: str,
+                                      chunk_size: int = 65536) -> Iterator[bytes]:
+        """
+        Stream raw file content at a specific commit in fixed-size chunks.
+        
+        The first chunk is read eagerly so that a missing object raises here
+        rather than after a response has started.
+        
+        Args:
+            dataset_path: Path to the dataset
+            commit_hash: Commit hash
+            file_path: Path to the file
+            chunk_size: Number of bytes per chunk
+        
+        Returns:
+            Iterator over the file content as bytes
+        
+        Raises:
+            GitOperationError: If git operation fails
+        """
+        if not os.path.exists(dataset_path):
+            raise DatasetError(f"Dataset path does not exist: {dataset_path}", dataset_path=dataset_path)
+        
+        cmd = ['git', 'show', f'{commit_hash}:{file_path}']
+        proc = subprocess.Popen(cmd, cwd=dataset_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        
+        first_chunk = proc.stdout.read(chunk_size)
+        if not first_chunk and proc.wait() != 0:
+            stderr = proc.stderr.read().decode(errors='replace')
+            proc.stdout.close()
+            proc.stderr.close()
+            raise GitOperationError(f"Failed to get file content: {stderr}", command=cmd,
+                                    returncode=proc.returncode, stderr=stderr)
+        
+        def generate():
+            try:
+                if first_chunk:
+                    yield first_chunk
+                yield from iter(lambda: proc.stdout.read(chunk_size), b'')
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                proc.wait()
+                proc.stdout.close()
+                proc.stderr.close()
+        
+        return generate()
+    
     def revert_commit(self, dataset_path: str, commit_hash: str, commit_message: str = None) -> dict:
         """
         Revert a specific commit.
@@ -448,7 +690,8 @@ class GitOperationsService(BaseService):
             # If custom message provided, amend the revert commit
             if commit_message:
                 subprocess.run(['git', 'commit', '--amend', '-m', commit_message], 
-                             cwd=dataset_path, capture_output=True, text=True, check=True)
+                             cwd=dataset_path, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                             text=True, check=True)
             
             return {
                 'success': True,
@@ -629,7 +872,7 @@ class GitOperationsService(BaseService):
             # Check if commit exists
             try:
                 subprocess.run(['git', 'cat-file', '-e', commit_hash], 
-                             cwd=dataset_path, capture_output=True, check=True)
+                             cwd=dataset_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
                 debug_info['commit_exists'] = True
             except subprocess.CalledProcessError:
                 debug_info['errors'].append(f"Commit {commit_hash} does not exist")
@@ -637,7 +880,7 @@ class GitOperationsService(BaseService):
             # Check if file exists in commit
             try:
                 subprocess.run(['git', 'cat-file', '-e', f"{commit_hash}:{file_path}"], 
-                             cwd=dataset_path, capture_output=True, check=True)
+                             cwd=dataset_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
                 debug_info['file_exists_in_commit'] = True
             except subprocess.CalledProcessError:
                 debug_info['errors'].append(f"File {file_path} does not exist in commit {commit_hash}")
@@ -724,7 +967,7 @@ class GitOperationsService(BaseService):
             # Check if commit exists
             try:
                 subprocess.run(['git', 'cat-file', '-e', commit_hash], 
-                             cwd=dataset_path, capture_output=True, check=True)
+                             cwd=dataset_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
             except subprocess.CalledProcessError:
                 comparison_info['errors'].append(f"Commit {commit_hash} does not exist")
                 return comparison_info
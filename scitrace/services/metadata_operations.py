@@ -6,12 +6,24 @@ Handles metadata operations and dataset information retrieval.
 
 import os
 import json
+import copy
+import hashlib
+import subprocess
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 
 from ..utils.datalad_utils import DataLadUtils, DataLadCommandError
 from ..exceptions import DatasetError, ValidationError
 from .base_service import BaseService
+from .git_operations import GitOperationsService
+from .file_operations import FileOperationsService
+
+# Dataflow layouts keyed by dataset path, each pinned to the git state it was built from
+DATAFLOW_CACHE_MAX_ENTRIES = 64
+_DATAFLOW_CACHE = OrderedDict()
+_DATAFLOW_CACHE_LOCK = threading.Lock()
 
 
 class MetadataOperationsService(BaseService):
@@ -20,6 +32,8 @@ class MetadataOperationsService(BaseService):
     def __init__(self, db=None):
         super().__init__(db)
         self.datalad_utils = DataLadUtils()
+        self.file_operations = FileOperationsService(db)
+        self.git_operations = GitOperationsService(db)
     
     def get_dataset_info(self, dataset_path: str) -> Dict[str, Any]:
         """
@@ -83,9 +97,7 @@ class MetadataOperationsService(BaseService):
         
         try:
             # Get file tree structure
-            from .file_operations import FileOperationsService
-            file_ops = FileOperationsService()
-            file_tree = file_ops.get_file_tree(dataset_path)
+            file_tree = self.file_operations.get_file_tree(dataset_path)
             
             # Analyze structure
             total_files = 0
@@ -114,9 +126,7 @@ class MetadataOperationsService(BaseService):
             # Get commit count
             commit_count = 0
             try:
-                from .git_operations import GitOperationsService
-                git_ops = GitOperationsService()
-                commits = git_ops.get_commit_history(dataset_path, limit=1000)
+                commits = self.git_operations.get_commit_history(dataset_path, limit=1000)
                 commit_count = len(commits)
             except Exception:
                 pass  # Git operations might fail, that's okay
@@ -158,11 +168,54 @@ class MetadataOperationsService(BaseService):
         if not os.path.exists(dataset_path):
             raise DatasetError(f"Dataset path does not exist: {dataset_path}", dataset_path=dataset_path)
         
+        # Reuse the layout while HEAD and the working-tree status are unchanged
+        state = self._get_dataset_state(dataset_path)
+        if state:
+            with _DATAFLOW_CACHE_LOCK:
+                cached = _DATAFLOW_CACHE.get(dataset_path)
+                if cached and cached[0] == state:
+                    _DATAFLOW_CACHE.move_to_end(dataset_path)
+                    dataflow_data = copy.deepcopy(cached[1])
+                    dataflow_data['metadata']['created_at'] = datetime.now(timezone.utc).isoformat()
+                    return dataflow_data
+        
+        dataflow_data = self._build_dataflow_from_dataset(dataset_path)
+        
+        if state:
+            with _DATAFLOW_CACHE_LOCK:
+                _DATAFLOW_CACHE[dataset_path] = (state, copy.deepcopy(dataflow_data))
+                _DATAFLOW_CACHE.move_to_end(dataset_path)
+                while len(_DATAFLOW_CACHE) > DATAFLOW_CACHE_MAX_ENTRIES:
+                    _DATAFLOW_CACHE.popitem(last=False)
+        
+        return dataflow_data
+    
+    def _get_dataset_state(self, dataset_path: str) -> Optional[str]:
+        """
+        Fingerprint a dataset's HEAD and working-tree status.
+        
+        Args:
+            dataset_path: Path to the dataset
+        
+        Returns:
+            Hex digest, or None if the dataset is not a usable git repository
+        """
+        try:
+            # porcelain v2 with --branch carries the HEAD oid alongside the change list
+            result = subprocess.run(
+                ['git', 'status', '--porcelain=v2', '--branch', '-z', '--untracked-files=all'],
+                cwd=dataset_path, capture_output=True, check=True
+            )
+        except (subprocess.CalledProcessError, OSError):
+            return None
+        
+        return hashlib.blake2b(result.stdout, digest_size=16).hexdigest()
+    
+    def _build_dataflow_from_dataset(self, dataset_path: str) -> Dict[str, Any]:
+        """Walk the dataset and build the spider web dataflow layout."""
         try:
             # Get actual dataset structure
-            from .file_operations import FileOperationsService
-            file_ops = FileOperationsService()
-            file_tree = file_ops.get_file_tree(dataset_path)
+            file_tree = self.file_operations.get_file_tree(dataset_path)
             
             # Analyze dataset content and create spider web workflow
             nodes = []
@@ -203,7 +256,7 @@ class MetadataOperationsService(BaseService):
                     file_count = len([f for f in item.get('children', []) if f['type'] == 'file'])
                     
                     # Get tracking status for this directory
-                    stage_data = file_ops.get_stage_files(dataset_path, item['name'])
+                    stage_data = self.file_operations.get_stage_files(dataset_path, item['name'])
                     tracked_count = stage_data['metadata']['tracked_files'] if stage_data else 0
                     untracked_count = stage_data['metadata']['untracked_files'] if stage_data else 0
                     deleted_count = stage_data['metadata']['deleted_files'] if stage_data else 0
@@ -359,11 +412,9 @@ class MetadataOperationsService(BaseService):
             git_metadata = {}
             if os.path.exists(os.path.join(dataset_path, '.git')):
                 try:
-                    from .git_operations import GitOperationsService
-                    git_ops = GitOperationsService()
                     git_metadata = {
-                        'current_branch': git_ops.get_current_branch(dataset_path),
-                        'commit_count': len(git_ops.get_commit_history(dataset_path, limit=1000))
+                        'current_branch': self.git_operations.get_current_branch(dataset_path),
+                        'commit_count': len(self.git_operations.get_commit_history(dataset_path, limit=1000))
                     }
                 except Exception:
                     pass  # Git operations might fail
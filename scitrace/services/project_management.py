@@ -7,6 +7,7 @@ Handles project creation, management, and dashboard operations.
 import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
+from sqlalchemy.orm import load_only
 
 from ..services.base_service import BaseService
 from ..exceptions import ProjectError, ValidationError
@@ -116,8 +117,13 @@ class ProjectManagementService(BaseService):
             project_ids = [p.id for p in projects]
             tasks = Task.query.filter(Task.project_id.in_(project_ids)).all() if project_ids else []
             
-            # Get dataflows for these projects
-            dataflows = Dataflow.query.filter(Dataflow.project_id.in_(project_ids)).all() if project_ids else []
+            # Get dataflows for these projects; the dashboard lists and counts them,
+            # so the nodes/edges/metadata JSON is left unloaded
+            dataflows = (Dataflow.query
+                         .options(load_only(Dataflow.id, Dataflow.name, Dataflow.description,
+                                            Dataflow.project_id, Dataflow.created_at))
+                         .filter(Dataflow.project_id.in_(project_ids))
+                         .all()) if project_ids else []
             
             # Calculate statistics
             stats = self._calculate_project_stats(projects, tasks, dataflows)
@@ -52,6 +52,18 @@ class ProjectService:
         """Create a DataLad dataset for a project."""
         return self.dataset_integration.create_dataset_for_project(project_id, project_name, research_type)
     
+    def create_datasets_for_projects(self, projects: List[Dict[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Create DataLad datasets for several projects at once."""
+        return self.dataset_integration.create_datasets_for_projects(projects)
+    
+    def start_dataset_creation_for_project(self, project_id: str, project_name: str, research_type: str = "general") -> Dict[str, Any]:
+        """Start creating a DataLad dataset for a project in the background."""
+        return self.dataset_integration.start_dataset_creation_for_project(project_id, project_name, research_type)
+    
+    def get_dataset_creation_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the state of a background dataset creation job."""
+        return self.dataset_integration.get_dataset_creation_status(job_id)
+    
     def get_project_dataset_info(self, project_id: str) -> Dict[str, Any]:
         """Get dataset information for a project."""
         return self.dataset_integration.get_project_dataset_info(project_id)
@@ -85,29 +97,21 @@ class ProjectService:
         """Legacy method for getting commit history."""
         # This method is kept for backward compatibility
         # It should be replaced with get_project_commit_history in new code
-        from .git_operations import GitOperationsService
-        git_ops = GitOperationsService()
-        return git_ops.get_commit_history(dataset_path, file_path, limit)
+        return self.dataset_integration.git_operations.get_commit_history(dataset_path, file_path, limit)
     
     def restore_file_to_commit(self, dataset_path: str, file_path: str, commit_hash: str, commit_message: str = None) -> Dict[str, Any]:
         """Legacy method for restoring files."""
         # This method is kept for backward compatibility
         # It should be replaced with restore_project_file in new code
-        from .git_operations import GitOperationsService
-        git_ops = GitOperationsService()
-        return git_ops.restore_file_to_commit(dataset_path, file_path, commit_hash, commit_message)
+        return self.dataset_integration.git_operations.restore_file_to_commit(dataset_path, file_path, commit_hash, commit_message)
     
     def get_file_commit_history(self, dataset_path: str, file_path: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Legacy method for getting file commit history."""
         # This method is kept for backward compatibility
         # It should be replaced with get_project_commit_history in new code
-        from .git_operations import GitOperationsService
-        git_ops = GitOperationsService()
-        return git_ops.get_file_commit_history(dataset_path, file_path, limit)
+        return self.dataset_integration.git_operations.get_file_commit_history(dataset_path, file_path, limit)
     
     def check_file_exists_in_commit(self, dataset_path: str, file_path: str, commit_hash: str) -> bool:
         """Legacy method for checking file existence in commit."""
         # This method is kept for backward compatibility
-        from .git_operations import GitOperationsService
-        git_ops = GitOperationsService()
-        return git_ops.check_file_exists_in_commit(dataset_path, file_path, commit_hash)
+        return self.dataset_integration.git_operations.check_file_exists_in_commit(dataset_path, file_path, commit_hash)
@@ -5,8 +5,9 @@ Provides decorators and utilities for access control and user permission checks.
 """
 
 from functools import wraps
-from flask import jsonify, request, abort
+from flask import jsonify, request, abort, g
 from flask_login import current_user, login_required
+from sqlalchemy.orm import joinedload, contains_eager
 from ..models import Project, Task, Dataflow
 
 
@@ -106,6 +107,26 @@ def require_dataflow_access(f):
     return decorated_function
 
 
+def require_dataflow_api_access(f):
+    """
+    Decorator for dataflow API routes.
+    
+    Loads the dataflow together with its project in one query, checks that
+    the current user administers the project and exposes it as g.dataflow.
+    Must be applied below login_required.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        dataflow = Dataflow.query.options(joinedload(Dataflow.project)) \
+            .filter_by(id=kwargs.get('dataflow_id')).first_or_404()
+        if dataflow.project.admin_id != current_user.id:
+            return jsonify({'error': 'Access denied'}), 403
+        
+        g.dataflow = dataflow
+        return f(*args, **kwargs)
+    return decorated_function
+
+
 def require_ownership_or_admin(resource_type):
     """
     Decorator factory to require ownership of a resource or admin role.
@@ -327,3 +348,60 @@ def get_user_accessible_dataflows(user_id=None):
     
     # Regular users can see dataflows in their projects
     return Dataflow.query.filter(Dataflow.project.has(admin_id=user_id))
+
+
+def get_owned_project_or_404(project_id, *options):
+    """
+    Load a project owned by the current user, or abort with 404.
+    
+    Ownership is part of the query, so another user's project is
+    indistinguishable from a missing one.
+    
+    Args:
+        project_id: The project ID
+        *options: Extra loader options for the query
+    
+    Returns:
+        Project: The project
+    """
+    return (Project.query
+            .options(*options)
+            .filter_by(id=project_id, admin_id=current_user.id)
+            .first_or_404())
+
+
+def get_owned_task_or_404(task_id, *options):
+    """
+    Load a task assigned to the current user, or abort with 404.
+    
+    Args:
+        task_id: The task ID
+        *options: Extra loader options for the query
+    
+    Returns:
+        Task: The task
+    """
+    return (Task.query
+            .options(*options)
+            .filter_by(id=task_id, user_id=current_user.id)
+            .first_or_404())
+
+
+def get_owned_dataflow_or_404(dataflow_id):
+    """
+    Load a dataflow from one of the current user's projects, or abort with 404.
+    
+    The project is joined for the ownership filter and populated from the
+    same row.
+    
+    Args:
+        dataflow_id: The dataflow ID
+    
+    Returns:
+        Dataflow: The dataflow, with its project loaded
+    """
+    return (Dataflow.query
+            .join(Dataflow.project)
+            .options(contains_eager(Dataflow.project))
+            .filter(Dataflow.id == dataflow_id, Project.admin_id == current_user.id)
+            .first_or_404())
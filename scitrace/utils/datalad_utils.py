@@ -7,6 +7,7 @@ Provides centralized subprocess calls and error handling for DataLad operations.
 import os
 import subprocess
 import logging
+import threading
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import tempfile
@@ -17,6 +18,10 @@ from .response_utils import APIResponse, handle_exception
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Result of the `datalad --version` probe, shared by every DataLadUtils in the process
+_DATALAD_AVAILABLE = None
+_DATALAD_CHECK_LOCK = threading.Lock()
+
 
 class DataLadCommandError(Exception):
     """Custom exception for DataLad command errors."""
@@ -49,14 +54,18 @@ class DataLadUtils:
             self.datalad_available = self._check_datalad_availability()
     
     def _check_datalad_availability(self) -> bool:
-        """Check if DataLad is available in the system."""
-        try:
-            result = self._run_command(['datalad', '--version'], timeout=10)
-            logger.info(f"DataLad available: {result['stdout'].strip()}")
-            return True
-        except (DataLadCommandError, FileNotFoundError):
-            logger.warning("DataLad not available in system PATH")
-            return False
+        """Check if DataLad is available in the system; probed once per process."""
+        global _DATALAD_AVAILABLE
+        with _DATALAD_CHECK_LOCK:
+            if _DATALAD_AVAILABLE is None:
+                try:
+                    result = self._run_command(['datalad', '--version'], timeout=10)
+                    logger.info(f"DataLad available: {result['stdout'].strip()}")
+                    _DATALAD_AVAILABLE = True
+                except (DataLadCommandError, FileNotFoundError):
+                    logger.warning("DataLad not available in system PATH")
+                    _DATALAD_AVAILABLE = False
+            return _DATALAD_AVAILABLE
     
     def _run_command(
         self, 
@@ -144,7 +153,8 @@ class DataLadUtils:
         self, 
         dataset_path: str, 
         research_type: str = "general",
-        name: str = None
+        name: str = None,
+        path_reserved: bool = False
     ) -> Dict[str, Any]:
         """
         Create a new DataLad dataset.
@@ -153,6 +163,8 @@ class DataLadUtils:
             dataset_path: Path where to create the dataset
             research_type: Type of research (affects dataset structure)
             name: Optional name for the dataset
+            path_reserved: The caller has just created dataset_path as an
+                empty directory, so it is not checked for existence
         
         Returns:
             Dict containing creation result information
@@ -164,7 +176,7 @@ class DataLadUtils:
                 returncode=-1
             )
         
-        if os.path.exists(dataset_path):
+        if not path_reserved and os.path.exists(dataset_path):
             raise DataLadCommandError(
                 message=f"Dataset already exists at {dataset_path}",
                 command=['datalad', 'create'],
@@ -0,0 +1,54 @@
+"""
+JSON provider for SciTrace
+
+Serializes Flask JSON responses with orjson while keeping the output of
+Flask's default provider (sorted keys, HTTP dates, str() for Decimal/UUID).
+"""
+
+import json
+import typing as t
+
+import orjson
+from flask.json.provider import JSONProvider, _default
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson."""
+    
+    sort_keys = True
+    
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        """
+        Serialize data as JSON.
+        
+        Args:
+            obj: The data to serialize
+            **kwargs: Accepted for compatibility; only ``indent`` is honoured
+        
+        Returns:
+            JSON string
+        """
+        # Datetimes go through Flask's default hook so they stay HTTP dates
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        
+        return orjson.dumps(obj, default=_default, option=option).decode('utf-8')
+    
+    def loads(self, s: t.Union[str, bytes], **kwargs: t.Any) -> t.Any:
+        """
+        Deserialize data as JSON.
+        
+        Args:
+            s: Text or UTF-8 bytes
+            **kwargs: Decoder hooks, e.g. ``object_hook`` from the session serializer
+        
+        Returns:
+            Deserialized data
+        """
+        # orjson has no decoder hooks, so hooked calls use the stdlib decoder
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
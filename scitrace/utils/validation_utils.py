@@ -6,6 +6,7 @@ Provides standardized form validation utilities to reduce duplicate validation c
 
 import re
 import os
+import sys
 from typing import Dict, List, Any, Optional, Callable, Union
 from datetime import datetime, date
 from urllib.parse import urlparse
@@ -540,3 +541,25 @@ def sanitize_input(value: str, max_length: int = None) -> str:
         sanitized = sanitized[:max_length]
     
     return sanitized
+
+
+# datetime.fromisoformat() accepts a trailing 'Z' from Python 3.11 on
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+def parse_iso_datetime(value: str) -> datetime:
+    """
+    Parse an ISO 8601 date/time string, accepting a trailing 'Z' for UTC.
+    
+    Args:
+        value: ISO 8601 string, e.g. from a datetime-local input or a JSON payload
+    
+    Returns:
+        Parsed datetime; aware if the string carries an offset or 'Z'
+    
+    Raises:
+        ValueError: If the string is not a valid ISO 8601 date/time
+    """
+    if _FROMISOFORMAT_ACCEPTS_Z or not value.endswith('Z'):
+        return datetime.fromisoformat(value)
+    return datetime.fromisoformat(value[:-1] + '+00:00')
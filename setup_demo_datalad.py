@@ -124,7 +124,7 @@ def create_single_demo_project(project_config, project_num):
                 name=project_config['name'],
                 description=project_config['description'],
                 admin_id=admin_user.id,
-                collaborators=json.dumps(['demo_user@scitrace.local']),
+                collaborators=['demo_user@scitrace.local'],
                 status='ongoing',
                 created_at=datetime.now(),
                 updated_at=datetime.now()
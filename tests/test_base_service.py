@@ -0,0 +1,52 @@
+"""
+Tests for BaseService's per-request lookup cache
+"""
+
+import pytest
+
+from scitrace import create_app
+from scitrace.models import db, Project
+from scitrace.services import BaseService
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv('DATALAD_BASE_PATH', str(tmp_path / 'datasets'))
+    app = create_app()
+    with app.app_context():
+        yield app
+
+
+def _add_project(project_id):
+    project = Project(project_id=project_id, name=project_id, admin_id=1)
+    db.session.add(project)
+    return project
+
+
+def test_count_and_exists_see_pending_rows(app):
+    service = BaseService(db)
+    for i in range(5):
+        _add_project(f'P{i}')
+    db.session.commit()
+    
+    assert service.count(Project, admin_id=1) == 5
+    assert not service.exists(Project, project_id='P5')
+    
+    _add_project('P5')
+    
+    assert service.count(Project, admin_id=1) == 6
+    assert service.exists(Project, project_id='P5')
+
+
+def test_count_sees_pending_delete(app):
+    service = BaseService(db)
+    project = _add_project('P0')
+    db.session.commit()
+    
+    assert service.count(Project) == 1
+    
+    db.session.delete(project)
+    
+    assert service.count(Project) == 0
+    assert not service.exists(Project, project_id='P0')